@@ -0,0 +1,37 @@
+"""add_embedding_cache
+
+Revision ID: 0009b20a07eb
+Revises: 78c3c5697d27
+Create Date: 2026-10-17 11:26:52.907311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009b20a07eb'
+down_revision: Union[str, Sequence[str], None] = '78c3c5697d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add persistent embedding cache."""
+    op.create_table('embedding_cache',
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('dimensions', sa.Integer(), nullable=False),
+    sa.Column('text_hash', sa.String(), nullable=False),
+    sa.Column('vector', sa.LargeBinary(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('model', 'dimensions', 'text_hash')
+    )
+    op.create_index(op.f('ix_embedding_cache_last_used_at'), 'embedding_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Remove persistent embedding cache."""
+    op.drop_index(op.f('ix_embedding_cache_last_used_at'), table_name='embedding_cache')
+    op.drop_table('embedding_cache')
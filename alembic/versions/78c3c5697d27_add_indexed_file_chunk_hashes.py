@@ -0,0 +1,29 @@
+"""add_indexed_file_chunk_hashes
+
+Revision ID: 78c3c5697d27
+Revises: ce44a7160eb1
+Create Date: 2026-10-17 10:04:17.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78c3c5697d27'
+down_revision: Union[str, Sequence[str], None] = 'ce44a7160eb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add per-file chunk hash manifest."""
+    # NULL means unknown: the file's points are replaced on its next re-index
+    op.add_column('indexed_files', sa.Column('chunk_hashes', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove per-file chunk hash manifest."""
+    op.drop_column('indexed_files', 'chunk_hashes')
@@ -0,0 +1,43 @@
+"""add_indexing_jobs
+
+Revision ID: b5e2d81c4f90
+Revises: 0009b20a07eb
+Create Date: 2026-10-17 13:02:41.118604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2d81c4f90'
+down_revision: Union[str, Sequence[str], None] = '0009b20a07eb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add background indexing job status."""
+    op.create_table('indexing_jobs',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('chunks_done', sa.Integer(), nullable=False),
+    sa.Column('chunks_total', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_indexing_jobs_file_path'), 'indexing_jobs', ['file_path'], unique=True)
+
+
+def downgrade() -> None:
+    """Remove background indexing job status."""
+    op.drop_index(op.f('ix_indexing_jobs_file_path'), table_name='indexing_jobs')
+    op.drop_table('indexing_jobs')
@@ -0,0 +1,33 @@
+"""add_indexed_file_mtime
+
+Revision ID: ce44a7160eb1
+Revises: 9f0d7140b47a
+Create Date: 2026-10-17 09:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce44a7160eb1'
+down_revision: Union[str, Sequence[str], None] = '9f0d7140b47a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track file mtime for stat-based change detection."""
+    # Existing rows get NULL and are rehashed once on next use
+    op.add_column('indexed_files', sa.Column('file_mtime_ns', sa.BigInteger(), nullable=True))
+
+    # Files over 2 GiB overflow INTEGER
+    op.alter_column('indexed_files', 'file_size', type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Remove file mtime tracking."""
+    op.alter_column('indexed_files', 'file_size', type_=sa.Integer(), existing_nullable=False)
+    op.drop_column('indexed_files', 'file_mtime_ns')
@@ -1,3 +1,4 @@
+from app.backend.api.admin import router as admin_router
 from app.backend.api.prompts import router as prompts_router
 from app.backend.api.settings import router as settings_router
 from app.backend.api.tools import router as tools_router
@@ -8,4 +9,5 @@ routers = [
     settings_router,
     prompts_router,
     tools_router,
+    admin_router,
 ]
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.database.models import IndexingJob
+from app.backend.database.session import get_db
+from app.backend.services.voice.recorder import get_recorder, live_recorders
+
+router = APIRouter()
+
+
+@router.get("/admin/sessions")
+async def get_sessions():
+    """List live voice sessions of this worker"""
+    return [recorder.summary() for recorder in live_recorders()]
+
+
+@router.get("/admin/sessions/{session_id}/flight-recorder")
+async def get_flight_recorder(session_id: str):
+    """Get recent message metadata of a live session"""
+    recorder = get_recorder(session_id)
+    if recorder is None:
+        raise HTTPException(status_code=404, detail=f"Session '{session_id}' not found")
+    return recorder.snapshot()
+
+
+@router.get("/admin/indexing-jobs")
+async def get_indexing_jobs(limit: int = 100, db: AsyncSession = Depends(get_db)):
+    """List most recently updated background indexing jobs"""
+    result = await db.execute(
+        select(IndexingJob).order_by(IndexingJob.updated_at.desc()).limit(min(limit, 1000))
+    )
+    return [
+        {
+            "file_path": job.file_path,
+            "status": job.status,
+            "priority": job.priority,
+            "chunks_done": job.chunks_done,
+            "chunks_total": job.chunks_total,
+            "error": job.error,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "updated_at": job.updated_at,
+        }
+        for job in result.scalars()
+    ]
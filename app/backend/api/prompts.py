@@ -7,6 +7,7 @@ from app.backend.constants.prompts import INSTRUCTIONS
 from app.backend.database.models import Prompt
 from app.backend.database.session import get_db
 from app.backend.logger import get_logger
+from app.backend.services.session_config_service import SessionConfigService
 
 logger = get_logger(__name__)
 router = APIRouter()
@@ -42,7 +43,9 @@ async def update_prompt(data: PromptUpdate, db: AsyncSession = Depends(get_db)):
         else:
             db.add(Prompt(content=data.prompt))
 
+        await SessionConfigService.notify_changed(db)
         await db.commit()
+        SessionConfigService.invalidate()
         logger.info("Prompt updated")
         return {"status": "success", "prompt": data.prompt}
     except Exception as e:
@@ -60,7 +63,9 @@ async def reset_prompt(db: AsyncSession = Depends(get_db)):
 
         if active_prompt:
             await db.delete(active_prompt)
+            await SessionConfigService.notify_changed(db)
             await db.commit()
+            SessionConfigService.invalidate()
             logger.info("Prompt reset to default")
 
         return {"status": "success", "prompt": INSTRUCTIONS}
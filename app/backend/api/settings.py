@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.backend.database.models import Settings
 from app.backend.database.session import get_db
 from app.backend.logger import get_logger
+from app.backend.services.session_config_service import SessionConfigService
 from app.backend.services.settings_service import SettingsService
 
 logger = get_logger(__name__)
@@ -99,8 +100,10 @@ async def update_settings(updates: SettingsUpdate, db: AsyncSession = Depends(ge
             )
             db.add(record)
 
+        await SessionConfigService.notify_changed(db)
         await db.commit()
         await db.refresh(record)
+        SessionConfigService.invalidate()
 
         logger.info("Settings updated")
         return {
@@ -123,7 +126,9 @@ async def reset_settings(db: AsyncSession = Depends(get_db)):
 
         if record:
             await db.delete(record)
+            await SessionConfigService.notify_changed(db)
             await db.commit()
+            SessionConfigService.invalidate()
             logger.info("Settings reset to defaults")
 
         default_schema = SettingsService.load_default_settings()
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.backend.database.models import Tool
 from app.backend.database.session import get_db
 from app.backend.logger import get_logger
+from app.backend.services.session_config_service import SessionConfigService
 from app.backend.services.tool_service import TOOL_GROUPS
 
 logger = get_logger(__name__)
@@ -65,8 +66,10 @@ async def toggle_tool(toggle_data: ToolToggle, db: AsyncSession = Depends(get_db
             tool = Tool(name=toggle_data.name, enabled=toggle_data.enabled)
             db.add(tool)
 
+        await SessionConfigService.notify_changed(db)
         await db.commit()
         await db.refresh(tool)
+        SessionConfigService.invalidate()
 
         logger.info(f"Tool '{toggle_data.name}' {'enabled' if toggle_data.enabled else 'disabled'}")
         return {"id": tool.id, "name": tool.name, "enabled": tool.enabled}
@@ -91,8 +94,10 @@ async def update_tool_description(update_data: ToolUpdate, db: AsyncSession = De
             tool = Tool(name=update_data.name, description=update_data.description)
             db.add(tool)
 
+        await SessionConfigService.notify_changed(db)
         await db.commit()
         await db.refresh(tool)
+        SessionConfigService.invalidate()
 
         logger.info(f"Tool '{update_data.name}' description updated")
         return {"id": tool.id, "name": tool.name, "description": tool.description}
@@ -113,8 +118,10 @@ async def reset_tool_description(tool_name: str, db: AsyncSession = Depends(get_
 
         if tool:
             tool.description = None
+            await SessionConfigService.notify_changed(db)
             await db.commit()
             await db.refresh(tool)
+            SessionConfigService.invalidate()
 
         logger.info(f"Tool '{tool_name}' description reset to default")
         return {
@@ -1,58 +1,95 @@
 import asyncio
 import contextlib
-import json
+import time
+import uuid
 
 from fastapi import APIRouter, WebSocket
-from sqlalchemy import select
 from starlette.websockets import WebSocketDisconnect
 
 from app.backend.config import get_settings
-from app.backend.constants.prompts import INSTRUCTIONS
-from app.backend.database.models import Prompt, Settings
-from app.backend.database.session import AsyncSessionLocal
 from app.backend.logger import get_logger
-from app.backend.services.settings_service import SettingsService
+from app.backend.metrics import (
+    ACTIVE_SESSIONS,
+    ERRORS,
+    SESSION_SETUP,
+    SESSIONS,
+)
+from app.backend.services.session_config_service import SessionConfigService
 from app.backend.services.tool_service import ToolService
 from app.backend.services.voice.agent import VoiceAgent
+from app.backend.services.voice.pool import get_realtime_pool
+from app.backend.services.voice.recorder import register_recorder, unregister_recorder
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Subprotocol offered by clients that send/receive audio as raw PCM16 binary frames
+BINARY_AUDIO_SUBPROTOCOL = "pcm16"
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     """WebSocket endpoint for voice agent"""
-    await websocket.accept()
+    started = time.monotonic()
+    session_id = uuid.uuid4().hex
+    binary_audio = BINARY_AUDIO_SUBPROTOCOL in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=BINARY_AUDIO_SUBPROTOCOL if binary_audio else None)
     settings = get_settings()
 
-    user_settings, instructions, active_prompt = await _load_session_config()
-    all_tools = await ToolService.get_all_tools()
-    prompt_type = "custom" if active_prompt else "default"
-    logger.info(f"New session started (prompt={prompt_type}, {len(all_tools)} tools)")
+    config = await SessionConfigService.get()
+    tools = await ToolService.get_registry()
+    prompt_type = "custom" if config.custom_prompt else "default"
+    audio_mode = "binary" if binary_audio else "json"
+    logger.info(
+        f"New session {session_id} started "
+        f"(prompt={prompt_type}, {len(tools)} tools, audio={audio_mode})"
+    )
 
     agent = VoiceAgent(
         model=settings.OPENAI_MODEL_NAME,
         api_key=settings.OPENAI_API_KEY,
-        user_settings=user_settings,
-        instructions=instructions,
-        tools=all_tools,
+        user_settings=config.user_settings,
+        instructions=config.instructions,
+        tools=tools,
+        binary_audio=binary_audio,
+        outbound_queue_size=settings.OUTBOUND_QUEUE_SIZE,
+        outbound_audio_policy=settings.OUTBOUND_AUDIO_POLICY,
+        session_id=session_id,
+        flight_recorder_size=settings.FLIGHT_RECORDER_SIZE,
+        realtime_url=settings.OPENAI_REALTIME_URL,
     )
+    register_recorder(agent.recorder)
 
+    SESSIONS.inc()
+    ACTIVE_SESSIONS.inc()
     try:
-        await agent.connect()
+        await agent.connect(pool=get_realtime_pool())
+        SESSION_SETUP.observe(time.monotonic() - started)
 
         async def handle_browser():
             try:
                 while True:
-                    message = await websocket.receive_text()
-                    await agent.handle_browser_message(message)
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(message.get("code", 1000))
+
+                    if (data := message.get("bytes")) is not None:
+                        await agent.handle_browser_audio(data)
+                    elif (text := message.get("text")) is not None:
+                        await agent.handle_browser_message(text)
             except WebSocketDisconnect:
                 logger.info("Browser disconnected")
             except Exception as e:
                 logger.error(f"Browser handler error: {type(e).__name__}: {e}")
 
+        async def browser_send(message: str | bytes) -> None:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(message)
+
         async def handle_openai():
-            await agent.process_openai_events(lambda msg: websocket.send_text(msg))
+            await agent.process_openai_events(browser_send)
 
         browser_task = asyncio.create_task(handle_browser())
         openai_task = asyncio.create_task(handle_openai())
@@ -66,41 +103,47 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
             with contextlib.suppress(asyncio.CancelledError):
                 await task
 
-        logger.info("Session ended")
+        logger.info(f"Session ended (outbound: {agent.stats()['outbound']})")
 
     except Exception as e:
         logger.error(f"Session error: {type(e).__name__}: {e}", exc_info=True)
+        ERRORS.inc(source="session")
+        agent.error = agent.error or f"session: {type(e).__name__}: {e}"
     finally:
+        ACTIVE_SESSIONS.dec()
+        unregister_recorder(session_id)
+        if agent.error:
+            await dump_flight_recorder(agent, settings.FLIGHT_RECORDER_DIR)
         await agent.disconnect()
         with contextlib.suppress(Exception):
             await websocket.close()
 
 
-async def _load_session_config() -> tuple[dict, str, Prompt | None]:
-    """Load settings and prompt from database"""
-    async with AsyncSessionLocal() as db:
-        default_schema = SettingsService.load_default_settings()
-
-        settings_result = await db.execute(select(Settings).limit(1))
-        custom_settings = settings_result.scalar_one_or_none()
-
-        if custom_settings:
-            custom_backend = json.loads(custom_settings.backend_settings)
-            custom_client = json.loads(custom_settings.client_settings)
-            backend = SettingsService.merge_settings(
-                default_schema.get("backend", {}), custom_backend
-            )
-            client = SettingsService.merge_settings(
-                default_schema.get("client", {}), custom_client
-            )
-        else:
-            backend = default_schema.get("backend", {})
-            client = default_schema.get("client", {})
+async def dump_flight_recorder(agent: VoiceAgent, directory: str) -> None:
+    """Write the session's flight recorder to disk after a failure"""
+    try:
+        path = await asyncio.to_thread(agent.recorder.dump, directory, agent.error or "")
+        logger.warning(
+            f"Session {agent.session_id} failed ({agent.error}), flight recorder: {path}"
+        )
+    except Exception as e:
+        logger.error(f"Failed to dump flight recorder: {e}")
 
-        user_settings = {"backend": backend, "client": client}
 
-        prompt_result = await db.execute(select(Prompt).limit(1))
-        active_prompt = prompt_result.scalar_one_or_none()
-        instructions = active_prompt.content if active_prompt else INSTRUCTIONS
+async def prewarm_realtime_pool() -> None:
+    """Pre-warm Realtime connection pool with the current session config"""
+    pool = get_realtime_pool()
+    if pool is None:
+        return
 
-        return user_settings, instructions, active_prompt
+    settings = get_settings()
+    config = await SessionConfigService.get()
+    agent = VoiceAgent(
+        model=settings.OPENAI_MODEL_NAME,
+        api_key=settings.OPENAI_API_KEY,
+        user_settings=config.user_settings,
+        instructions=config.instructions,
+        tools=await ToolService.get_registry(),
+        realtime_url=settings.OPENAI_REALTIME_URL,
+    )
+    pool.warm(agent.build_session_update())
@@ -1,3 +1,4 @@
+from typing import Literal
 from urllib.parse import quote_plus
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -6,11 +7,24 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_MODEL_NAME: str
+    # Realtime WebSocket endpoint (point at benchmarks/fake_realtime.py for load tests)
+    OPENAI_REALTIME_URL: str = "wss://api.openai.com/v1/realtime"
 
     TAVILY_API_KEY: str
 
-    QDRANT_URL: str
+    # Vector index: "qdrant" (QDRANT_URL) or "local", an in-process index under
+    # VECTOR_DATA_DIR for single-worker deployments. The local index searches files with
+    # at least VECTOR_HNSW_MIN_POINTS chunks through an HNSW graph ("hnsw" extra)
+    VECTOR_BACKEND: Literal["qdrant", "local"] = "qdrant"
+    QDRANT_URL: str = ""
     COLLECTION_NAME: str
+    VECTOR_DATA_DIR: str = "data/vectors"
+    VECTOR_HNSW_MIN_POINTS: int = 20_000
+
+    # Worker-wide Qdrant client: kept-alive HTTP connections, or gRPC on QDRANT_GRPC_PORT
+    QDRANT_POOL_SIZE: int = 10
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_GRPC_PORT: int = 6334
 
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -18,6 +32,55 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
 
+    # Per-session browser send queue
+    OUTBOUND_QUEUE_SIZE: int = 256
+    OUTBOUND_AUDIO_POLICY: Literal["block", "drop_oldest"] = "block"
+
+    # Pre-warmed OpenAI Realtime connections per session config (0 disables)
+    REALTIME_POOL_SIZE: int = 0
+    REALTIME_POOL_MAX_AGE_S: int = 600
+
+    # Per-session message ring buffer, written to FLIGHT_RECORDER_DIR when a session fails
+    FLIGHT_RECORDER_SIZE: int = 2048
+    FLIGHT_RECORDER_DIR: str = "data/flight_recorder"
+
+    # Embedding cache: persistent rows (Postgres) and per-worker query LRU entries
+    EMBEDDING_CACHE_MAX_ROWS: int = 200_000
+    EMBEDDING_QUERY_CACHE_SIZE: int = 1024
+
+    # search_in_file results per worker, by file version and normalized question (0 disables).
+    # With RETRIEVAL_CACHE_SIMILARITY > 0, a question whose embedding has at least that cosine
+    # similarity to a cached question about the same file reuses its results
+    RETRIEVAL_CACHE_SIZE: int = 512
+    RETRIEVAL_CACHE_TTL_S: float = 600.0
+    RETRIEVAL_CACHE_SIMILARITY: float = 0.0
+
+    # Indexing pipeline: texts per embedding request, parallel requests and upserts
+    EMBED_BATCH_SIZE: int = 256
+    EMBED_CONCURRENCY: int = 4
+    UPSERT_CONCURRENCY: int = 2
+    EMBED_MAX_RETRIES: int = 5
+
+    # Background indexing: concurrent jobs per worker, and how long search_in_file waits
+    # for a job before answering from the chunks indexed so far
+    INDEXING_WORKERS: int = 1
+    INDEX_WAIT_S: float = 3.0
+
+    # Document parsing in child processes: concurrent parsers per worker (0 parses in
+    # threads of the worker), wall/CPU time and address space limits per file (0 = no limit)
+    PARSE_WORKERS: int = 2
+    PARSE_TIMEOUT_S: float = 300.0
+    PARSE_CPU_LIMIT_S: int = 120
+    PARSE_MEMORY_LIMIT_MB: int = 2048
+
+    # Directories pre-indexed in the background (empty disables the watcher). Uses inotify
+    # when the "watch" extra is installed, else rescans every WATCH_POLL_INTERVAL_S
+    WATCH_DIRS: list[str] = []
+    WATCH_EXTENSIONS: list[str] = [".pdf", ".docx", ".xlsx", ".pptx", ".txt", ".md"]
+    WATCH_POLL_INTERVAL_S: float = 60.0
+    WATCH_MAX_CONCURRENT: int = 2
+    WATCH_MAX_PER_MINUTE: int = 30
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     @property
@@ -2,6 +2,7 @@ SEARCH_DESCRIPTION = "Search the internet for current events, locations, address
 
 SEARCH_IN_FILE_DESCRIPTION = """Search semantic content within a specific file.
 Auto-indexes the file if not already in knowledge base, then searches within it.
+Large files are indexed in the background; until done, results may cover only part of the file.
 Use when user wants to find specific information INSIDE a file by meaning, not just read it.
 Examples: "Find authentication logic in auth.py", "Where's the database config in settings.py?"
 Returns relevant sections found in the file."""
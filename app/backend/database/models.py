@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Text
+from sqlalchemy import BigInteger, DateTime, LargeBinary, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -60,7 +60,46 @@ class IndexedFile(Base, TimeMixin):
     file_path: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
     file_hash: Mapped[str] = mapped_column(nullable=False)
     file_type: Mapped[str] = mapped_column(nullable=False)
-    file_size: Mapped[int] = mapped_column(nullable=False)
+    file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # st_mtime_ns when file_hash was computed; unchanged size and mtime skip rehashing
+    file_mtime_ns: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    # JSON list of chunk content hashes currently stored in the vector collection
+    chunk_hashes: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     def __repr__(self) -> str:
         return f"<IndexedFile(id={self.id}, file_path={self.file_path})>"
+
+
+class EmbeddingCache(Base):
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(primary_key=True)
+    dimensions: Mapped[int] = mapped_column(primary_key=True)
+    text_hash: Mapped[str] = mapped_column(primary_key=True)
+    # float32 array
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<EmbeddingCache(model={self.model}, text_hash={self.text_hash})>"
+
+
+class IndexingJob(Base, TimeMixin):
+    __tablename__ = "indexing_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Latest job per file; a new request for the path reuses the row
+    file_path: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
+    # queued, running, done or failed
+    status: Mapped[str] = mapped_column(nullable=False)
+    priority: Mapped[int] = mapped_column(nullable=False)
+    chunks_done: Mapped[int] = mapped_column(default=0, nullable=False)
+    chunks_total: Mapped[int | None] = mapped_column(nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<IndexingJob(id={self.id}, file_path={self.file_path}, status={self.status})>"
@@ -1,17 +1,38 @@
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.backend.api import routers
+from app.backend.api.websocket import prewarm_realtime_pool
+from app.backend.config import get_settings
 from app.backend.database.session import (
     close_database_connections,
     test_database_connection,
 )
 from app.backend.logger import get_logger, setup_logging
+from app.backend.metrics import REGISTRY
+from app.backend.services.directory_watcher import DirectoryWatcher
+from app.backend.services.embedding_cache import embedding_cache_stats
+from app.backend.services.indexing_queue import (
+    IndexingQueue,
+    get_indexing_queue,
+    set_indexing_queue,
+)
+from app.backend.services.parsing_pool import ParsingPool, get_parsing_pool, set_parsing_pool
+from app.backend.services.rag_service import get_rag_service, set_rag_service
+from app.backend.services.session_config_service import SessionConfigService
+from app.backend.services.voice.agent import open_realtime_connection
+from app.backend.services.voice.pool import (
+    RealtimeConnectionPool,
+    get_realtime_pool,
+    set_realtime_pool,
+)
 
 setup_logging()
 logger = get_logger(__name__)
@@ -23,10 +44,74 @@ async def lifespan(_app: FastAPI):
     logger.info("Starting AI Personal Assistant")
 
     await test_database_connection()
+    config_listener = asyncio.create_task(SessionConfigService.listen())
+
+    settings = get_settings()
+    if settings.REALTIME_POOL_SIZE > 0:
+        pool = RealtimeConnectionPool(
+            lambda: open_realtime_connection(
+                settings.OPENAI_MODEL_NAME, settings.OPENAI_API_KEY, settings.OPENAI_REALTIME_URL
+            ),
+            size=settings.REALTIME_POOL_SIZE,
+            max_age_s=settings.REALTIME_POOL_MAX_AGE_S,
+        )
+        pool.start()
+        set_realtime_pool(pool)
+        try:
+            await prewarm_realtime_pool()
+            logger.info(f"Realtime connection pool enabled (size={settings.REALTIME_POOL_SIZE})")
+        except Exception as e:
+            logger.warning(f"Failed to pre-warm Realtime connection pool: {e}")
+
+    if settings.PARSE_WORKERS > 0:
+        set_parsing_pool(
+            ParsingPool(
+                settings.PARSE_WORKERS,
+                timeout_s=settings.PARSE_TIMEOUT_S,
+                cpu_limit_s=settings.PARSE_CPU_LIMIT_S,
+                memory_limit_mb=settings.PARSE_MEMORY_LIMIT_MB,
+            )
+        )
+
+    rag = get_rag_service()
+    indexing_queue = IndexingQueue(rag.index_file, workers=settings.INDEXING_WORKERS)
+    indexing_queue.start()
+    set_indexing_queue(indexing_queue)
+
+    watcher = None
+    if settings.WATCH_DIRS:
+        watcher = DirectoryWatcher(
+            indexing_queue,
+            settings.WATCH_DIRS,
+            settings.WATCH_EXTENSIONS,
+            poll_interval_s=settings.WATCH_POLL_INTERVAL_S,
+            max_concurrent=settings.WATCH_MAX_CONCURRENT,
+            max_per_minute=settings.WATCH_MAX_PER_MINUTE,
+        )
+        watcher.start()
+
     logger.info("Application ready")
 
     yield
 
+    if watcher:
+        await watcher.close()
+    await indexing_queue.close()
+    set_indexing_queue(None)
+    if parsing_pool := get_parsing_pool():
+        await parsing_pool.close()
+        set_parsing_pool(None)
+    await rag.close()
+    set_rag_service(None)
+
+    if pool := get_realtime_pool():
+        await pool.close()
+        set_realtime_pool(None)
+
+    config_listener.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await config_listener
+
     await close_database_connections()
     logger.info("Shutting down")
 
@@ -63,8 +148,23 @@ async def serve_ui():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    pool = get_realtime_pool()
+    stats = {
+        "embedding_cache": embedding_cache_stats(),
+        "retrieval_cache": get_rag_service().retrieval_cache.stats(),
+    }
+    if indexing_queue := get_indexing_queue():
+        stats["indexing"] = indexing_queue.stats()
+    if pool:
+        stats["realtime_pool"] = pool.stats()
     try:
         await test_database_connection()
-        return {"status": "healthy", "database": "connected"}
+        return {"status": "healthy", "database": "connected", **stats}
     except Exception:
-        return {"status": "degraded", "database": "disconnected"}
+        return {"status": "degraded", "database": "disconnected", **stats}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
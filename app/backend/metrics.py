@@ -0,0 +1,248 @@
+import bisect
+import math
+from collections.abc import Callable, Iterable
+
+# Latency buckets in seconds
+TURN_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    """Escape label value for Prometheus text format"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    """Render {name="value",...} label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render sample value"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Label values in declaration order"""
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> list[str]:
+        """Sample lines for this metric"""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render metric in Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ):
+        super().__init__(name, description, labelnames)
+        # Unlabelled series are exported from the start
+        self._values: dict[tuple[str, ...], float] = {} if labelnames else {(): 0}
+        self._collect = collect
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase counter"""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list[str]:
+        """Sample lines for this metric (collected lazily if a callback is set)"""
+        values = self._collect() if self._collect else self._values
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ):
+        super().__init__(name, description, labelnames)
+        # Unlabelled series are exported from the start
+        self._values: dict[tuple[str, ...], float] = {} if labelnames else {(): 0}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set gauge value"""
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase gauge value"""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease gauge value"""
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list[str]:
+        """Sample lines for this metric (collected lazily if a callback is set)"""
+        values = self._collect() if self._collect else self._values
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DURATION_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record observation"""
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> list[str]:
+        """Sample lines for this metric (cumulative buckets)"""
+        lines = []
+        bounds = [*self.buckets, math.inf]
+        for key, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts, strict=True):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        """Add metric to registry"""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+# Per-worker registry served at /metrics
+REGISTRY = MetricsRegistry()
+
+SESSIONS = REGISTRY.register(Counter("voice_sessions_total", "Voice sessions started"))
+ACTIVE_SESSIONS = REGISTRY.register(Gauge("voice_sessions_active", "Voice sessions in progress"))
+SESSION_SETUP = REGISTRY.register(
+    Histogram(
+        "voice_session_setup_seconds",
+        "Browser connect to upstream session ready",
+        buckets=TURN_BUCKETS,
+    )
+)
+EVENTS = REGISTRY.register(
+    Counter("voice_realtime_events_total", "OpenAI Realtime events received", ("type",))
+)
+ERRORS = REGISTRY.register(Counter("voice_errors_total", "Errors by source", ("source",)))
+SPEECH_TO_RESPONSE = REGISTRY.register(
+    Histogram(
+        "voice_turn_response_created_seconds",
+        "input_audio_buffer.speech_stopped to response.created",
+        buckets=TURN_BUCKETS,
+    )
+)
+SPEECH_TO_AUDIO = REGISTRY.register(
+    Histogram(
+        "voice_turn_first_audio_seconds",
+        "input_audio_buffer.speech_stopped to first response.audio.delta",
+        buckets=TURN_BUCKETS,
+    )
+)
+TOOL_DURATION = REGISTRY.register(
+    Histogram("voice_tool_duration_seconds", "Tool execution time", ("tool",))
+)
+RAG_INDEX_DURATION = REGISTRY.register(
+    Histogram("rag_index_duration_seconds", "Document indexing time")
+)
+RAG_SEARCH_DURATION = REGISTRY.register(
+    Histogram("rag_search_duration_seconds", "Similarity search time")
+)
+RAG_INDEXED_CHUNKS = REGISTRY.register(
+    Counter("rag_indexed_chunks_total", "Chunks embedded and upserted into the vector store")
+)
+PARSE_RESULTS = REGISTRY.register(
+    Counter("rag_parse_results_total", "Documents parsed in child processes", ("result",))
+)
+WATCHER_FILES = REGISTRY.register(
+    Counter("rag_watcher_files_total", "Files queued for indexing by the directory watcher")
+)
+EMBEDDING_CACHE = REGISTRY.register(
+    Counter(
+        "rag_embedding_cache_requests_total",
+        "Embedding cache lookups by tier and result",
+        ("tier", "result"),
+    )
+)
+RETRIEVAL_CACHE = REGISTRY.register(
+    Counter(
+        "rag_retrieval_cache_requests_total",
+        "search_in_file result cache lookups by tier and result",
+        ("tier", "result"),
+    )
+)
+POOL_ACQUIRES = REGISTRY.register(
+    Counter("voice_realtime_pool_acquires_total", "Pool checkouts by result", ("result",))
+)
+OUTBOUND_DROPPED = REGISTRY.register(
+    Counter("voice_outbound_dropped_audio_total", "Audio chunks dropped by full browser queues")
+)
+OUTBOUND_COALESCED = REGISTRY.register(
+    Counter(
+        "voice_outbound_coalesced_transcripts_total",
+        "Transcript deltas merged in backed-up browser queues",
+    )
+)
@@ -0,0 +1,257 @@
+import asyncio
+import contextlib
+import os
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.backend.database.models import IndexedFile
+from app.backend.database.session import AsyncSessionLocal, engine
+from app.backend.logger import get_logger
+from app.backend.metrics import WATCHER_FILES
+from app.backend.services.indexing_queue import FAILED, PRIORITY_BACKGROUND, IndexingQueue, Job
+
+try:
+    import watchfiles
+except ImportError:  # optional extra: pip install .[watch]
+    watchfiles = None
+
+logger = get_logger(__name__)
+
+# Postgres advisory lock key; the worker process holding it runs the watcher
+LEADER_LOCK_KEY = 0x5741_5443
+LEADER_RETRY_S = 30.0
+# How often the leader checks that its lock connection is still alive
+LEADER_PING_S = 10.0
+# How often a submitted job is checked for completion
+JOB_POLL_S = 30.0
+
+
+class DirectoryWatcher:
+    """Pre-indexes new and modified files under configured directories"""
+
+    def __init__(
+        self,
+        queue: IndexingQueue,
+        roots: list[str],
+        extensions: list[str],
+        poll_interval_s: float = 60.0,
+        max_concurrent: int = 2,
+        max_per_minute: int = 30,
+    ):
+        self.queue = queue
+        self.roots = [Path(root).expanduser().resolve() for root in roots]
+        self.extensions = {extension.lower() for extension in extensions}
+        self.poll_interval_s = poll_interval_s
+        self.max_per_minute = max(1, max_per_minute)
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        # Paths waiting for submission or indexing, in discovery order
+        self._pending: asyncio.Queue[str] = asyncio.Queue()
+        self._known: set[str] = set()
+        # Known paths that changed again after being queued; resubmitted when their job ends
+        self._dirty: set[str] = set()
+        # (size, mtime_ns) of file versions whose indexing failed; skipped until they change
+        self._failed: dict[str, tuple[int, int]] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start watching in the background"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()), asyncio.create_task(self._dispatch())]
+
+    async def close(self) -> None:
+        """Stop watching; queued indexing jobs are left to the queue"""
+        tasks = [*self._tasks, *self._jobs]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def _run(self) -> None:
+        """Watch while this worker process holds the leader lock"""
+        while True:
+            try:
+                async with self._leadership() as connection:
+                    if connection is not None:
+                        await self._lead(connection)
+            except Exception as e:
+                # Also reached when the database is down: no worker watches without the lock
+                logger.error(f"Directory watcher failed: {e}")
+            await asyncio.sleep(LEADER_RETRY_S)
+
+    @contextlib.asynccontextmanager
+    async def _leadership(self) -> AsyncIterator[AsyncConnection | None]:
+        """Connection holding the advisory lock, or None if another worker process leads"""
+        # Autocommit, so the connection doesn't sit idle in a transaction while leading
+        connection = await engine.connect()
+        locked = False
+        try:
+            await connection.execution_options(isolation_level="AUTOCOMMIT")
+            locked = await connection.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": LEADER_LOCK_KEY}
+            )
+            yield connection if locked else None
+        finally:
+            # close() only returns the connection to the pool, where its session would keep
+            # the lock: unlock explicitly, or end the session if that fails
+            try:
+                if locked:
+                    await asyncio.wait_for(
+                        connection.scalar(
+                            text("SELECT pg_advisory_unlock(:key)"), {"key": LEADER_LOCK_KEY}
+                        ),
+                        LEADER_PING_S,
+                    )
+            except Exception:
+                with contextlib.suppress(Exception):
+                    await connection.invalidate()
+            with contextlib.suppress(Exception):
+                await connection.close()
+
+    async def _lead(self, connection: AsyncConnection) -> None:
+        """Watch until the lock connection fails (the lock may then be held elsewhere)"""
+        logger.info(f"Watching {', '.join(map(str, self.roots))} for documents")
+        watch = asyncio.create_task(self._watch_roots())
+        try:
+            while not watch.done():
+                await asyncio.wait({watch}, timeout=LEADER_PING_S)
+                if not watch.done():
+                    await asyncio.wait_for(connection.scalar(text("SELECT 1")), LEADER_PING_S)
+            watch.result()
+        finally:
+            watch.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await watch
+
+    async def _watch_roots(self) -> None:
+        """Scan once, then follow notifications or rescan periodically"""
+        await self._scan()
+        if watchfiles:
+            await self._watch()
+        else:
+            while True:
+                await asyncio.sleep(self.poll_interval_s)
+                await self._scan()
+
+    async def _watch(self) -> None:
+        """Queue files reported by filesystem notifications (inotify on Linux)"""
+        watch_filter = watchfiles.DefaultFilter()
+        async for changes in watchfiles.awatch(
+            *self.roots,
+            watch_filter=lambda change, path: (
+                change != watchfiles.Change.deleted
+                and watch_filter(change, path)
+                and self._supported(path)
+            ),
+        ):
+            for _, path in changes:
+                if os.path.isfile(path):
+                    self._enqueue(str(Path(path).resolve()))
+
+    async def _scan(self) -> None:
+        """Queue files that are new or changed compared to the IndexedFile table"""
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(IndexedFile.file_path, IndexedFile.file_size, IndexedFile.file_mtime_ns)
+                )
+                indexed = {path: (size, mtime_ns) for path, size, mtime_ns in result.all()}
+        except Exception as e:
+            logger.warning(f"Directory scan skipped, indexed files unavailable: {e}")
+            return
+
+        start = time.perf_counter()
+        files = await asyncio.to_thread(self._list_files)
+        changed = [
+            path
+            for path, version in files.items()
+            if version not in (indexed.get(path), self._failed.get(path))
+        ]
+        for path in changed:
+            self._enqueue(path)
+        logger.info(
+            f"Scanned {len(files)} files in {time.perf_counter() - start:.1f}s, "
+            f"{len(changed)} to index"
+        )
+
+    def _list_files(self) -> dict[str, tuple[int, int]]:
+        """Supported files under the roots with their size and mtime"""
+        files = {}
+        for root in self.roots:
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames[:] = [name for name in dirnames if not name.startswith(".")]
+                for name in filenames:
+                    if name.startswith(".") or not self._supported(name):
+                        continue
+                    path = os.path.join(directory, name)
+                    try:
+                        if os.path.islink(path):
+                            path = str(Path(path).resolve())
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files[path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def _supported(self, path: str) -> bool:
+        """Whether the file extension is configured for indexing"""
+        return os.path.splitext(path)[1].lower() in self.extensions
+
+    def _enqueue(self, path: str) -> None:
+        """Queue path, or mark it for another run if it is already waiting or indexing"""
+        if path in self._known:
+            self._dirty.add(path)
+        else:
+            self._known.add(path)
+            self._pending.put_nowait(path)
+
+    async def _dispatch(self) -> None:
+        """Submit pending files at a limited rate and concurrency"""
+        interval = 60 / self.max_per_minute
+        next_at = 0.0
+        while True:
+            path = await self._pending.get()
+            await self._slots.acquire()
+            if (delay := next_at - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            next_at = time.monotonic() + interval
+            # The job reads the file as it is now, covering changes seen while waiting
+            self._dirty.discard(path)
+
+            try:
+                stat = os.stat(path)
+                job = await self.queue.submit(path, PRIORITY_BACKGROUND)
+            except Exception as e:
+                logger.error(f"Failed to queue {path} for indexing: {e}")
+                self._known.discard(path)
+                self._slots.release()
+                continue
+
+            WATCHER_FILES.inc()
+            task = asyncio.create_task(self._finish(path, job, (stat.st_size, stat.st_mtime_ns)))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+
+    async def _finish(self, path: str, job: Job, version: tuple[int, int]) -> None:
+        """Release the concurrency slot once the job is done"""
+        try:
+            while not await self.queue.wait(job, JOB_POLL_S):
+                pass
+            # Rescans skip a failed version; a changed file is tried again
+            if job.status == FAILED:
+                self._failed[path] = version
+            else:
+                self._failed.pop(path, None)
+        finally:
+            self._known.discard(path)
+            self._slots.release()
+            # Changed while indexing: the finished job may have read the old content
+            if path in self._dirty:
+                self._dirty.discard(path)
+                self._enqueue(path)
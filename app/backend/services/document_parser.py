@@ -0,0 +1,144 @@
+import hashlib
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from docx import Document as DocxDocument
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from openpyxl import load_workbook
+from pptx import Presentation
+from pypdf import PdfReader
+
+# Text is split into content-defined segments before chunking, so an edit only
+# shifts chunk boundaries within its own segment
+SEGMENT_MIN_CHARS = 4000
+SEGMENT_MAX_CHARS = 32000
+SEGMENT_ANCHOR_MASK = 0x7
+# str.splitlines() boundaries, except "\r" which may be the first half of "\r\n"
+LINE_ENDS = frozenset("\n\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029")
+
+# Loaders yield text in pieces of about this many characters (pages, slides and sheets
+# are yielded whole)
+TEXT_PIECE_CHARS = 1 << 16
+
+
+def chunk_hash(content: str) -> str:
+    """Content hash of a chunk"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def iter_chunks(file_path: str) -> Iterator[tuple[str, str]]:
+    """Stream (content hash, text) of the overlapping chunks of a file"""
+    for chunk in split_stream(iter_text(file_path)):
+        yield chunk_hash(chunk), chunk
+
+
+def load_text(file_path: str) -> str:
+    """Load text from various file types"""
+    return "".join(iter_text(file_path))
+
+
+def split_stream(pieces: Iterable[str]) -> Iterator[str]:
+    """Split streamed text into overlapping chunks"""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=200,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+    for text in segment(pieces):
+        yield from text_splitter.split_text(text)
+
+
+def segment(pieces: Iterable[str]) -> Iterator[str]:
+    """Cut streamed text at content-defined line boundaries (stable under local edits)"""
+    current: list[str] = []
+    size = 0
+    carry = ""
+    for piece in pieces:
+        lines = (carry + piece).splitlines(keepends=True)
+        # A partial last line (or a "\r" that may precede "\n") continues in the next piece
+        carry = lines.pop() if lines and lines[-1][-1] not in LINE_ENDS else ""
+        if len(carry) >= SEGMENT_MAX_CHARS:
+            # Don't buffer unbounded single lines
+            lines.append(carry)
+            carry = ""
+        for line in lines:
+            current.append(line)
+            size += len(line)
+            # Lines whose hash hits the mask end a segment once it is large enough
+            anchor = size >= SEGMENT_MIN_CHARS and (
+                zlib.crc32(line.encode("utf-8")) & SEGMENT_ANCHOR_MASK == 0
+            )
+            if anchor or size >= SEGMENT_MAX_CHARS:
+                yield "".join(current)
+                current, size = [], 0
+    if carry:
+        current.append(carry)
+    if current:
+        yield "".join(current)
+
+
+def iter_text(file_path: str) -> Iterator[str]:
+    """Stream text of various file types piece by piece"""
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+
+    if suffix == ".docx":
+        # The document XML is parsed whole; only the text is streamed
+        doc = DocxDocument(file_path)
+        separator = ""
+        for p in doc.paragraphs:
+            if p.text.strip():
+                yield separator + p.text
+                separator = "\n"
+
+    elif suffix == ".pdf":
+        # Pages are parsed on demand; text is extracted one page at a time
+        reader = PdfReader(file_path)
+        separator = ""
+        for page in reader.pages:
+            if page_text := page.extract_text():
+                yield separator + page_text
+                separator = "\n\n"
+
+    elif suffix == ".xlsx":
+        # Read-only mode streams rows from the sheet XML instead of building the workbook
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            separator = ""
+            for sheet_name in workbook.sheetnames:
+                block = [f"{separator}Sheet: {sheet_name}\n"]
+                size = 0
+                for row in workbook[sheet_name].iter_rows(values_only=True):
+                    row_text = "\t".join(str(cell) if cell is not None else "" for cell in row)
+                    if row_text.strip():
+                        block.append(row_text)
+                        size += len(row_text)
+                        if size >= TEXT_PIECE_CHARS:
+                            yield "\n".join(block)
+                            block, size = [""], 0
+                yield "\n".join(block)
+                separator = "\n"
+        finally:
+            workbook.close()
+
+    elif suffix == ".pptx":
+        prs = Presentation(file_path)
+        separator = ""
+        for i, slide in enumerate(prs.slides, 1):
+            texts = [f"Slide {i}:"]
+            for shape in slide.shapes:
+                if hasattr(shape, "text") and shape.text:
+                    texts.append(shape.text)
+            yield separator + "\n\n".join(texts)
+            separator = "\n\n"
+
+    else:
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                while piece := f.read(TEXT_PIECE_CHARS):
+                    yield piece
+        except UnicodeDecodeError as e:
+            raise ValueError(
+                f"File is not a supported format or has unsupported encoding: {file_path}"
+            ) from e
@@ -0,0 +1,202 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.config import get_settings
+from app.backend.database.models import EmbeddingCache
+from app.backend.database.session import AsyncSessionLocal
+from app.backend.logger import get_logger
+from app.backend.metrics import EMBEDDING_CACHE
+
+logger = get_logger(__name__)
+
+# last_used_at is refreshed at most this often, so hits rarely cost a write
+TOUCH_INTERVAL = timedelta(hours=1)
+# Rows inserted by this worker between size checks
+EVICT_EVERY = 1000
+# Rows per statement, well below Postgres' bind parameter limit
+BATCH_SIZE = 1000
+
+# Worker-wide query embedding LRU: (model, dimensions, text hash) -> vector
+_query_cache: OrderedDict[tuple[str, int, str], list[float]] = OrderedDict()
+_stats = {"memory": {"hits": 0, "misses": 0}, "db": {"hits": 0, "misses": 0}}
+_inserted_since_evict = 0
+
+
+def text_hash(content: str) -> str:
+    """Cache key of a text"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def embedding_cache_stats() -> dict[str, Any]:
+    """Hits, misses and hit ratio per cache tier (this worker)"""
+    return {
+        tier: {
+            **counts,
+            "hit_rate": (
+                round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+                if counts["hits"] + counts["misses"]
+                else None
+            ),
+        }
+        for tier, counts in _stats.items()
+    } | {"memory_size": len(_query_cache)}
+
+
+def _count(tier: str, hits: int, misses: int) -> None:
+    """Record cache lookups"""
+    _stats[tier]["hits"] += hits
+    _stats[tier]["misses"] += misses
+    if hits:
+        EMBEDDING_CACHE.inc(hits, tier=tier, result="hit")
+    if misses:
+        EMBEDDING_CACHE.inc(misses, tier=tier, result="miss")
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper caching vectors in Postgres, with an in-memory LRU for queries"""
+
+    def __init__(self, embeddings: Embeddings):
+        settings = get_settings()
+        self.embeddings = embeddings
+        self.model = str(getattr(embeddings, "model", type(embeddings).__name__))
+        self.dimensions = int(getattr(embeddings, "dimensions", None) or 0)
+        self.max_rows = settings.EMBEDDING_CACHE_MAX_ROWS
+        self.query_cache_size = settings.EMBEDDING_QUERY_CACHE_SIZE
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents (synchronous calls bypass the cache)"""
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed query (synchronous calls bypass the cache)"""
+        return self.embeddings.embed_query(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents, calling the model only for texts not cached yet"""
+        hashes = [text_hash(content) for content in texts]
+        vectors = await self._load(set(hashes))
+
+        missing: dict[str, str] = {}
+        for content, key in zip(texts, hashes, strict=True):
+            if key not in vectors:
+                missing.setdefault(key, content)
+        _count("db", len(texts) - sum(key in missing for key in hashes), len(missing))
+
+        if missing:
+            embedded = await self.embeddings.aembed_documents(list(missing.values()))
+            new = dict(zip(missing, embedded, strict=True))
+            await self._store(new)
+            vectors.update(new)
+
+        return [vectors[key] for key in hashes]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """Embed query, checking the in-memory LRU and then the persistent cache"""
+        key = text_hash(text)
+        memory_key = (self.model, self.dimensions, key)
+        if (vector := _query_cache.get(memory_key)) is not None:
+            _query_cache.move_to_end(memory_key)
+            _count("memory", 1, 0)
+            return vector
+        _count("memory", 0, 1)
+
+        vector = (await self._load({key})).get(key)
+        _count("db", int(vector is not None), int(vector is None))
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            await self._store({key: vector})
+
+        _query_cache[memory_key] = vector
+        while len(_query_cache) > self.query_cache_size:
+            _query_cache.popitem(last=False)
+        return vector
+
+    async def _load(self, hashes: set[str]) -> dict[str, list[float]]:
+        """Fetch cached vectors by text hash; cache errors count as misses"""
+        if not hashes:
+            return {}
+        keys = list(hashes)
+        vectors: dict[str, list[float]] = {}
+        try:
+            async with AsyncSessionLocal() as db:
+                now = datetime.now(UTC)
+                for start in range(0, len(keys), BATCH_SIZE):
+                    batch = keys[start : start + BATCH_SIZE]
+                    result = await db.execute(
+                        select(EmbeddingCache.text_hash, EmbeddingCache.vector).where(
+                            EmbeddingCache.model == self.model,
+                            EmbeddingCache.dimensions == self.dimensions,
+                            EmbeddingCache.text_hash.in_(batch),
+                        )
+                    )
+                    found = {key: array("f", blob).tolist() for key, blob in result.all()}
+                    if not found:
+                        continue
+                    vectors.update(found)
+                    await db.execute(
+                        update(EmbeddingCache)
+                        .where(
+                            EmbeddingCache.model == self.model,
+                            EmbeddingCache.dimensions == self.dimensions,
+                            EmbeddingCache.text_hash.in_(found),
+                            EmbeddingCache.last_used_at < now - TOUCH_INTERVAL,
+                        )
+                        .values(last_used_at=now)
+                    )
+                await db.commit()
+                return vectors
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    async def _store(self, vectors: dict[str, list[float]]) -> None:
+        """Persist vectors, evicting least recently used rows beyond the size limit"""
+        global _inserted_since_evict
+
+        try:
+            now = datetime.now(UTC)
+            rows = [
+                {
+                    "model": self.model,
+                    "dimensions": self.dimensions,
+                    "text_hash": key,
+                    "vector": array("f", vector).tobytes(),
+                    "last_used_at": now,
+                }
+                for key, vector in vectors.items()
+            ]
+            async with AsyncSessionLocal() as db:
+                for start in range(0, len(rows), BATCH_SIZE):
+                    await db.execute(
+                        insert(EmbeddingCache)
+                        .values(rows[start : start + BATCH_SIZE])
+                        .on_conflict_do_nothing()
+                    )
+
+                _inserted_since_evict += len(vectors)
+                if _inserted_since_evict >= EVICT_EVERY:
+                    _inserted_since_evict = 0
+                    await self._evict(db)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    async def _evict(self, db: AsyncSession) -> None:
+        """Delete all but the max_rows most recently used rows"""
+        key = tuple_(EmbeddingCache.model, EmbeddingCache.dimensions, EmbeddingCache.text_hash)
+        oldest = (
+            select(EmbeddingCache.model, EmbeddingCache.dimensions, EmbeddingCache.text_hash)
+            .order_by(EmbeddingCache.last_used_at.desc())
+            .offset(self.max_rows)
+        )
+        result = await db.execute(delete(EmbeddingCache).where(key.in_(oldest)))
+        if result.rowcount:
+            logger.info(f"Evicted {result.rowcount} embedding cache entries")
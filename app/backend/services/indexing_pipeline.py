@@ -0,0 +1,135 @@
+import asyncio
+import random
+import time
+from collections.abc import Callable
+
+import openai
+from langchain_core.documents import Document as LangchainDocument
+from langchain_core.embeddings import Embeddings
+
+from app.backend.logger import get_logger
+from app.backend.metrics import RAG_INDEXED_CHUNKS
+from app.backend.services.vector_store import VectorStore
+
+logger = get_logger(__name__)
+
+# Transient embedding API failures worth retrying
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+BACKOFF_BASE_S = 1.0
+BACKOFF_MAX_S = 30.0
+PROGRESS_LOG_INTERVAL_S = 2.0
+
+# Called with (chunks done, chunks total) at the start and after every upserted batch
+ProgressCallback = Callable[[int, int], None]
+
+
+class IndexingPipeline:
+    def __init__(
+        self,
+        store: VectorStore,
+        embeddings: Embeddings,
+        batch_size: int = 256,
+        embed_concurrency: int = 4,
+        upsert_concurrency: int = 2,
+        max_retries: int = 5,
+    ):
+        self.store = store
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.embed_concurrency = max(1, embed_concurrency)
+        self.upsert_concurrency = max(1, upsert_concurrency)
+        self.max_retries = max_retries
+
+    async def run(
+        self,
+        chunks: list[tuple[str, LangchainDocument]],
+        label: str,
+        progress: ProgressCallback | None = None,
+    ) -> None:
+        """Embed (point id, chunk) pairs in parallel batches, upserting each batch when ready"""
+        total = len(chunks)
+        if not total:
+            return
+
+        embed_slots = asyncio.Semaphore(self.embed_concurrency)
+        upsert_slots = asyncio.Semaphore(self.upsert_concurrency)
+        start = time.monotonic()
+        last_log = start
+        done = 0
+        if progress:
+            progress(0, total)
+
+        async def process(batch: list[tuple[str, LangchainDocument]]) -> None:
+            nonlocal done, last_log
+            async with embed_slots:
+                vectors = await self._embed([chunk.page_content for _, chunk in batch])
+
+            # Payload layout matches langchain-qdrant so existing collections stay searchable
+            async with upsert_slots:
+                await self.store.upsert(
+                    [point_id for point_id, _ in batch],
+                    vectors,
+                    [
+                        {"page_content": chunk.page_content, "metadata": chunk.metadata}
+                        for _, chunk in batch
+                    ],
+                )
+
+            done += len(batch)
+            RAG_INDEXED_CHUNKS.inc(len(batch))
+            if progress:
+                progress(done, total)
+
+            now = time.monotonic()
+            if now - last_log >= PROGRESS_LOG_INTERVAL_S and done < total:
+                last_log = now
+                logger.info(
+                    f"Indexing {label}: {done}/{total} chunks ({done / (now - start):.0f} chunks/s)"
+                )
+
+        # A batch failing for good cancels the rest; callers see its error, not a group
+        try:
+            async with asyncio.TaskGroup() as group:
+                for i in range(0, total, self.batch_size):
+                    group.create_task(process(chunks[i : i + self.batch_size]))
+        except ExceptionGroup as e:
+            raise e.exceptions[0] from None
+
+        elapsed = time.monotonic() - start
+        logger.info(
+            f"Embedded {total} chunks of {label} in {elapsed:.1f}s "
+            f"({total / elapsed if elapsed else total:.0f} chunks/s)"
+        )
+
+    async def _embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed one batch, backing off on rate limits and transient errors"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.embeddings.aembed_documents(texts)
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                logger.warning(
+                    f"Embedding batch failed ({type(e).__name__}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Server-requested delay if given, else exponential backoff with jitter"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(BACKOFF_MAX_S, float(retry_after))
+        except ValueError:
+            pass
+        return min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2**attempt) * random.uniform(0.5, 1.0)
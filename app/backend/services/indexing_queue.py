@@ -0,0 +1,288 @@
+import asyncio
+import contextlib
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.backend.database.models import IndexingJob
+from app.backend.database.session import AsyncSessionLocal
+from app.backend.logger import get_logger
+from app.backend.metrics import ERRORS, REGISTRY, Gauge
+from app.backend.services.indexing_pipeline import ProgressCallback
+
+logger = get_logger(__name__)
+
+# Lower values run first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+ACTIVE = (QUEUED, RUNNING)
+
+# An active job not updated for this long is assumed lost with its worker process
+STALE_AFTER = timedelta(minutes=10)
+PROGRESS_WRITE_INTERVAL_S = 1.0
+# Polling interval while waiting for a job owned by another worker process
+REMOTE_POLL_INTERVAL_S = 0.5
+
+# Indexes one file, reporting (chunks done, chunks total)
+IndexFunc = Callable[[str, ProgressCallback], Awaitable[None]]
+
+
+class Job:
+    __slots__ = (
+        "file_path",
+        "priority",
+        "status",
+        "chunks_done",
+        "chunks_total",
+        "error",
+        "remote",
+        "finished",
+    )
+
+    def __init__(self, file_path: str, priority: int):
+        self.file_path = file_path
+        self.priority = priority
+        self.status = QUEUED
+        self.chunks_done = 0
+        self.chunks_total: int | None = None
+        self.error: str | None = None
+        # Claimed by another worker process; progress is read from the database
+        self.remote = False
+        self.finished = asyncio.Event()
+
+    def progress(self) -> str:
+        """Human-readable progress"""
+        if self.status == QUEUED:
+            return "queued"
+        if self.chunks_total is None:
+            return "parsing"
+        return f"{self.chunks_done}/{self.chunks_total} chunks embedded"
+
+
+class IndexingQueue:
+    """Per-worker background indexing with job status tracked in the database"""
+
+    def __init__(self, index: IndexFunc, workers: int = 1):
+        self._index = index
+        self.workers = max(1, workers)
+        # (priority, sequence, file path); superseded entries are skipped
+        self._queue: asyncio.PriorityQueue[tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        # Active jobs of this worker by file path
+        self._jobs: dict[str, Job] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._writes: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start worker tasks"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        """Stop workers; interrupted jobs are picked up again once stale"""
+        tasks = [*self._tasks, *self._writes]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    def stats(self) -> dict[str, int]:
+        """Active job counts of this worker"""
+        statuses = [job.status for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in ACTIVE}
+
+    async def submit(self, file_path: str, priority: int = PRIORITY_BACKGROUND) -> Job:
+        """Queue file for indexing, joining the active job for the path if there is one"""
+        if job := self._jobs.get(file_path):
+            if job.status == QUEUED and priority < job.priority:
+                job.priority = priority
+                self._queue.put_nowait((priority, next(self._sequence), file_path))
+                self._write(job)
+            return job
+
+        job = Job(file_path, priority)
+        # Registered before claiming so concurrent submits join this job
+        self._jobs[file_path] = job
+        if not await self._claim(job):
+            del self._jobs[file_path]
+            job.remote = True
+            return job
+
+        self._queue.put_nowait((priority, next(self._sequence), file_path))
+        return job
+
+    async def wait(self, job: Job, timeout: float) -> bool:
+        """Wait up to timeout seconds for job to finish; True if it did"""
+        deadline = time.monotonic() + timeout
+        while not job.finished.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if job.remote:
+                await asyncio.sleep(min(REMOTE_POLL_INTERVAL_S, remaining))
+                await self._refresh(job)
+            else:
+                # Bounded so a job turning remote during its claim is noticed
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        job.finished.wait(), min(REMOTE_POLL_INTERVAL_S, remaining)
+                    )
+        return True
+
+    async def _work(self) -> None:
+        """Run queued jobs, highest priority first"""
+        while True:
+            priority, _, file_path = await self._queue.get()
+            job = self._jobs.get(file_path)
+            if job is None or job.status != QUEUED or job.priority != priority:
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Job) -> None:
+        """Index one file and record the outcome"""
+        last_write = 0.0
+
+        def progress(done: int, total: int) -> None:
+            nonlocal last_write
+            job.chunks_done, job.chunks_total = done, total
+            now = time.monotonic()
+            if now - last_write >= PROGRESS_WRITE_INTERVAL_S:
+                last_write = now
+                self._write(job)
+
+        job.status = RUNNING
+        await self._save(job, started_at=datetime.now(UTC))
+        try:
+            await self._index(job.file_path, progress)
+            job.status = DONE
+        except Exception as e:
+            logger.error(f"Background indexing of {job.file_path} failed: {e}")
+            ERRORS.inc(source="rag")
+            job.status, job.error = FAILED, str(e)
+        finally:
+            del self._jobs[job.file_path]
+            job.finished.set()
+
+        await self._save(job, finished_at=datetime.now(UTC))
+        logger.info(f"Indexing job for {job.file_path} {job.status}")
+
+    async def _claim(self, job: Job) -> bool:
+        """Take ownership of the path's job row unless another worker holds an active one"""
+        now = datetime.now(UTC)
+        fields = {
+            "status": QUEUED,
+            "priority": job.priority,
+            "chunks_done": 0,
+            "chunks_total": None,
+            "error": None,
+            "started_at": None,
+            "finished_at": None,
+            "updated_at": now,
+        }
+        statement = (
+            insert(IndexingJob)
+            .values(file_path=job.file_path, created_at=now, **fields)
+            .on_conflict_do_update(
+                index_elements=[IndexingJob.file_path],
+                set_=fields,
+                where=or_(
+                    IndexingJob.status.notin_(ACTIVE),
+                    IndexingJob.updated_at < now - STALE_AFTER,
+                ),
+            )
+            .returning(IndexingJob.id)
+        )
+        try:
+            async with AsyncSessionLocal() as db:
+                claimed = (await db.execute(statement)).scalar_one_or_none() is not None
+                await db.commit()
+        except Exception as e:
+            # Without job tracking, index in this worker
+            logger.warning(f"Failed to record indexing job for {job.file_path}: {e}")
+            return True
+
+        if not claimed:
+            await self._refresh(job)
+        return claimed
+
+    async def _refresh(self, job: Job) -> None:
+        """Load status of a job owned by another worker"""
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(IndexingJob).where(IndexingJob.file_path == job.file_path)
+                )
+                row = result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"Failed to read indexing job for {job.file_path}: {e}")
+            return
+
+        if row is None:
+            job.status = DONE
+        else:
+            job.status, job.error = row.status, row.error
+            job.chunks_done, job.chunks_total = row.chunks_done, row.chunks_total
+        if job.status not in ACTIVE:
+            job.finished.set()
+
+    def _write(self, job: Job) -> None:
+        """Save job state in the background"""
+        task = asyncio.create_task(self._save(job))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _save(self, job: Job, **fields: Any) -> None:
+        """Persist job state; failures only cost status visibility"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IndexingJob)
+                    .where(IndexingJob.file_path == job.file_path)
+                    .values(
+                        status=job.status,
+                        priority=job.priority,
+                        chunks_done=job.chunks_done,
+                        chunks_total=job.chunks_total,
+                        error=job.error,
+                        updated_at=datetime.now(UTC),
+                        **fields,
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save indexing job for {job.file_path}: {e}")
+
+
+_queue: IndexingQueue | None = None
+
+
+def get_indexing_queue() -> IndexingQueue | None:
+    """Get the worker's indexing queue (None outside the app, e.g. in scripts)"""
+    return _queue
+
+
+def set_indexing_queue(queue: IndexingQueue | None) -> None:
+    """Install the worker's indexing queue"""
+    global _queue
+    _queue = queue
+
+
+def _collect_jobs() -> dict[tuple[str, ...], float]:
+    """Active job counts of the worker's queue"""
+    return {(status,): count for status, count in _queue.stats().items()} if _queue else {}
+
+
+REGISTRY.register(
+    Gauge(
+        "rag_indexing_jobs", "Active background indexing jobs", ("status",), collect=_collect_jobs
+    )
+)
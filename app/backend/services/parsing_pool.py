@@ -0,0 +1,230 @@
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from multiprocessing.connection import Connection
+
+from app.backend.logger import get_logger
+from app.backend.metrics import PARSE_RESULTS
+from app.backend.services.document_parser import iter_chunks
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits are skipped
+    resource = None
+
+logger = get_logger(__name__)
+
+# Documents parsed by one process before it is replaced (bounds heap growth)
+MAX_FILES_PER_PROCESS = 50
+# Pipe polling interval where the event loop can't watch file descriptors
+POLL_SLICE_S = 0.5
+
+
+def _limit_cpu(cpu_limit_s: int) -> None:
+    """Allow cpu_limit_s more seconds of CPU time; the kernel then sends SIGXCPU"""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + 1 + cpu_limit_s
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _parse_worker(conn: Connection, cpu_limit_s: int, memory_limit_mb: int) -> None:
+    """Child process: write (hash, chunk) lines of each requested file to its output path"""
+    if resource and memory_limit_mb:
+        limit = memory_limit_mb * 2**20
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        file_path, out_path = request
+        try:
+            if resource and cpu_limit_s:
+                _limit_cpu(cpu_limit_s)
+            count = 0
+            with open(out_path, "w", encoding="utf-8") as f:
+                for chunk_hash, chunk in iter_chunks(file_path):
+                    # JSON escapes newlines and tabs, keeping one chunk per line
+                    f.write(f"{chunk_hash}\t{json.dumps(chunk)}\n")
+                    count += 1
+            conn.send(("ok", count))
+        except MemoryError:
+            conn.send(("error", f"Parsing {file_path} exceeded {memory_limit_mb} MB of memory"))
+        except Exception as e:
+            conn.send(("error", str(e) or type(e).__name__))
+
+
+async def _wait_readable(conn: Connection, timeout_s: float) -> bool:
+    """Wait until the parser answers or exits; False on timeout. Cancellation returns
+    immediately instead of leaving a thread blocked on the pipe"""
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+    try:
+        loop.add_reader(conn.fileno(), lambda: ready.done() or ready.set_result(None))
+    except NotImplementedError:
+        # Proactor event loop (Windows): poll in short slices
+        deadline = loop.time() + timeout_s
+        while (remaining := deadline - loop.time()) > 0:
+            if await asyncio.to_thread(conn.poll, min(POLL_SLICE_S, remaining)):
+                return True
+        return False
+
+    try:
+        await asyncio.wait_for(ready, timeout_s)
+        return True
+    except TimeoutError:
+        return False
+    finally:
+        loop.remove_reader(conn.fileno())
+
+
+def _read_chunks(f) -> Iterator[tuple[str, str]]:
+    """(hash, chunk) pairs from a parse output file"""
+    for line in f:
+        chunk_hash, _, encoded = line.partition("\t")
+        yield chunk_hash, json.loads(encoded)
+
+
+class _Parser:
+    __slots__ = ("process", "conn", "files")
+
+    def __init__(self, process: multiprocessing.Process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.files = 0
+
+
+class ParsingPool:
+    """Parses documents in child processes, at most `workers` at a time"""
+
+    def __init__(
+        self,
+        workers: int,
+        timeout_s: float,
+        cpu_limit_s: int = 0,
+        memory_limit_mb: int = 0,
+    ):
+        self.workers = max(1, workers)
+        self.timeout_s = timeout_s
+        self.cpu_limit_s = cpu_limit_s
+        self.memory_limit_mb = memory_limit_mb
+        # The fork server starts children from a clean process with the parsers imported;
+        # forking the worker itself would copy its threads' held locks
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload([__name__])
+        else:
+            self._context = multiprocessing.get_context("spawn")
+        self._slots = asyncio.Semaphore(self.workers)
+        # Processes are reused (startup re-imports the main module) until one fails
+        self._idle: list[_Parser] = []
+
+    async def close(self) -> None:
+        """Stop idle parser processes"""
+        idle, self._idle = self._idle, []
+        for parser in idle:
+            await self._stop(parser)
+
+    @contextlib.asynccontextmanager
+    async def parse(self, file_path: str) -> AsyncIterator[Iterator[tuple[str, str]]]:
+        """Parse file in a child process, then stream its (hash, chunk) pairs"""
+        fd, out_path = tempfile.mkstemp(prefix="parse-", suffix=".jsonl")
+        os.close(fd)
+        try:
+            async with self._slots:
+                count = await self._run(file_path, out_path)
+            logger.debug(f"Parsed {count} chunks from {file_path}")
+            with open(out_path, encoding="utf-8") as f:
+                yield _read_chunks(f)
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(out_path)
+
+    async def _run(self, file_path: str, out_path: str) -> int:
+        """Parse in an idle or new process and return the chunk count; raises on failure"""
+        parser = self._idle.pop() if self._idle else await self._start()
+        healthy = False
+        try:
+            parser.conn.send((file_path, out_path))
+            if not await _wait_readable(parser.conn, self.timeout_s):
+                PARSE_RESULTS.inc(result="timeout")
+                raise TimeoutError(f"Parsing {file_path} took longer than {self.timeout_s:g}s")
+
+            try:
+                status, detail = parser.conn.recv()
+            except (EOFError, ConnectionResetError):
+                # Exited without reporting (killed by a signal or crashed)
+                await asyncio.to_thread(parser.process.join, 1)
+                exitcode = parser.process.exitcode
+                if resource and exitcode == -signal.SIGXCPU:
+                    PARSE_RESULTS.inc(result="timeout")
+                    raise TimeoutError(
+                        f"Parsing {file_path} used more than {self.cpu_limit_s}s of CPU time"
+                    ) from None
+                PARSE_RESULTS.inc(result="crash")
+                raise RuntimeError(
+                    f"Parser crashed on {file_path} (exit code {exitcode})"
+                ) from None
+
+            if status == "error":
+                PARSE_RESULTS.inc(result="error")
+                raise ValueError(detail)
+            PARSE_RESULTS.inc(result="ok")
+            healthy = True
+            return detail
+        finally:
+            # Also reached on cancellation: a process that may still be parsing, or
+            # failed in a possibly bad state, is replaced
+            parser.files += 1
+            if healthy and parser.files < MAX_FILES_PER_PROCESS:
+                self._idle.append(parser)
+            else:
+                await self._stop(parser)
+
+    async def _start(self) -> _Parser:
+        """Start a parser process"""
+        receiver, sender = self._context.Pipe()
+        process = self._context.Process(
+            target=_parse_worker,
+            args=(sender, self.cpu_limit_s, self.memory_limit_mb),
+            daemon=True,
+        )
+        await asyncio.to_thread(process.start)
+        sender.close()
+        return _Parser(process, receiver)
+
+    async def _stop(self, parser: _Parser) -> None:
+        """Stop a parser process, killing it if it doesn't exit promptly"""
+        with contextlib.suppress(OSError, ValueError):
+            parser.conn.send(None)
+        await asyncio.to_thread(parser.process.join, 1)
+        if parser.process.is_alive():
+            parser.process.kill()
+            await asyncio.to_thread(parser.process.join)
+        parser.conn.close()
+
+
+_pool: ParsingPool | None = None
+
+
+def get_parsing_pool() -> ParsingPool | None:
+    """Get the worker's parsing pool (None parses in a thread of the worker)"""
+    return _pool
+
+
+def set_parsing_pool(pool: ParsingPool | None) -> None:
+    """Install the worker's parsing pool"""
+    global _pool
+    _pool = pool
@@ -1,17 +1,16 @@
 import asyncio
+import contextlib
 import hashlib
+import json
+import os
+import time
+import uuid
+from collections.abc import AsyncIterator, Iterator
 from pathlib import Path
 
-from docx import Document as DocxDocument
 from langchain_core.documents import Document as LangchainDocument
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from langchain_qdrant import QdrantVectorStore
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from openpyxl import load_workbook
-from pptx import Presentation
-from pypdf import PdfReader
-from qdrant_client import QdrantClient, models
-from qdrant_client.models import Distance, VectorParams
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,18 +18,74 @@ from app.backend.config import get_settings
 from app.backend.database.models import IndexedFile
 from app.backend.database.session import AsyncSessionLocal
 from app.backend.logger import get_logger
+from app.backend.metrics import ERRORS, RAG_INDEX_DURATION, RAG_SEARCH_DURATION
+from app.backend.services.document_parser import iter_chunks
+from app.backend.services.embedding_cache import CachedEmbeddings
+from app.backend.services.indexing_pipeline import IndexingPipeline, ProgressCallback
+from app.backend.services.indexing_queue import (
+    FAILED,
+    PRIORITY_INTERACTIVE,
+    get_indexing_queue,
+)
+from app.backend.services.parsing_pool import get_parsing_pool
+from app.backend.services.retrieval_cache import RetrievalCache
+from app.backend.services.vector_store import VectorStore, create_vector_store
 
 logger = get_logger(__name__)
 
+# Point ids are derived from (source, chunk hash) so unchanged chunks keep their points
+CHUNK_NAMESPACE = uuid.UUID("5b0c4f8e-2f61-4a43-9d3e-7f2a9c1d6b84")
+
+# New chunks held in memory per indexing window, in embedding batches
+INDEX_WINDOW_BATCHES = 8
+
+
+def _point_id(source: str, chunk_hash: str) -> str:
+    """Deterministic vector store point id of a chunk (a UUID, as Qdrant requires)"""
+    return str(uuid.uuid5(CHUNK_NAMESPACE, f"{source}\n{chunk_hash}"))
+
+
+def _offset_progress(progress: ProgressCallback | None, offset: int) -> ProgressCallback | None:
+    """Progress callback of one indexing window, counting from offset"""
+    if progress is None:
+        return None
+    return lambda done, total: progress(offset + done, offset + total)
+
 
 class RAGService:
-    def __init__(self):
+    def __init__(
+        self,
+        store: VectorStore | None = None,
+        embeddings: Embeddings | None = None,
+    ):
         self.settings = get_settings()
-        self.collection_name = self.settings.COLLECTION_NAME
-        self.qdrant_url = self.settings.QDRANT_URL
-        self.vector_store: QdrantVectorStore | None = None
+        self.store = store or create_vector_store(self.settings)
+        # Queries keep the client's own retries. Indexing retries transient API errors itself
+        # (EMBED_MAX_RETRIES), so its client doesn't: both layers would multiply the attempts
+        self.embeddings = embeddings or CachedEmbeddings(OpenAIEmbeddings())
+        self.index_embeddings = embeddings or CachedEmbeddings(OpenAIEmbeddings(max_retries=0))
+        self.retrieval_cache = RetrievalCache(
+            self.settings.RETRIEVAL_CACHE_SIZE,
+            ttl_s=self.settings.RETRIEVAL_CACHE_TTL_S,
+            similarity=self.settings.RETRIEVAL_CACHE_SIMILARITY,
+        )
 
-    def search_in_file(self, file_path: str, question: str) -> str:
+    async def close(self) -> None:
+        """Close vector store connection"""
+        await self.store.close()
+
+    def _pipeline(self) -> IndexingPipeline:
+        """Batched embed/upsert pipeline for this store"""
+        return IndexingPipeline(
+            self.store,
+            self.index_embeddings,
+            batch_size=self.settings.EMBED_BATCH_SIZE,
+            embed_concurrency=self.settings.EMBED_CONCURRENCY,
+            upsert_concurrency=self.settings.UPSERT_CONCURRENCY,
+            max_retries=self.settings.EMBED_MAX_RETRIES,
+        )
+
+    async def search_in_file(self, file_path: str, question: str) -> str:
         """Search within a specific file - auto-indexes if needed"""
         try:
             path = Path(file_path).expanduser().resolve()
@@ -41,164 +96,258 @@ class RAGService:
             if not path.is_file():
                 return f"Error: '{file_path}' is not a file"
 
-            async def check_and_index():
-                async with AsyncSessionLocal() as db:
-                    result = await db.execute(
-                        select(IndexedFile).where(IndexedFile.file_path == str(path))
-                    )
-                    existing = result.scalar_one_or_none()
-                    file_hash = self._calculate_hash(str(path))
-
-                    if not existing or existing.file_hash != file_hash:
-                        logger.info(f"Auto-indexing {path}...")
-                        await self._index_document(str(path), db)
-
-            asyncio.run(check_and_index())
-
-            self._init_vector_store()
-            results = self.vector_store.similarity_search( # type: ignore
-                question,
-                k=3,
-                filter=models.Filter(
-                    must=[
-                        models.FieldCondition(
-                            key="metadata.source",
-                            match=models.MatchValue(value=str(path)),
-                        )
-                    ]
-                ),
-            )
+            stat = path.stat()
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(IndexedFile).where(IndexedFile.file_path == str(path))
+                )
+                existing = result.scalar_one_or_none()
+
+            # Cached results are only valid for the indexed version of the file
+            cached_version = existing.file_hash if self._is_current(existing, stat) else None
+            job = None
+            if cached_version is None:
+                if (queue := get_indexing_queue()) is None:
+                    # No background queue outside the app (scripts): index inline
+                    await self.index_file(str(path))
+                else:
+                    # Wait briefly, then answer from the chunks indexed so far
+                    job = await queue.submit(str(path), PRIORITY_INTERACTIVE)
+                    if await queue.wait(job, self.settings.INDEX_WAIT_S):
+                        if job.status == FAILED:
+                            return f"Error: Failed to index {file_path}: {job.error}"
+                        job = None
+
+            start = time.perf_counter()
+            results = await self._similarity_search(question, str(path), 3, cached_version)
+            RAG_SEARCH_DURATION.observe(time.perf_counter() - start)
 
             if not results:
+                if job:
+                    return (
+                        f"{file_path} is being indexed in the background ({job.progress()}) "
+                        "and nothing is searchable yet. Try again in a moment."
+                    )
                 return f"No relevant information found in {file_path}"
 
             response = f"Found {len(results)} relevant sections in {file_path}:\n\n"
-            for i, doc in enumerate(results, 1):
-                response += f"Section {i}:\n{doc.page_content}\n\n"
+            if job:
+                response = (
+                    f"{file_path} is still being indexed ({job.progress()}), "
+                    f"so results may be incomplete. {response}"
+                )
+            for i, content in enumerate(results, 1):
+                response += f"Section {i}:\n{content}\n\n"
 
             return response.strip()
 
         except Exception as e:
             logger.error(f"Failed to search in {file_path}: {e}")
+            ERRORS.inc(source="rag")
             return f"Error: {str(e)}"
 
-    def _init_vector_store(self):
-        """Initialize vector store connection"""
-        if self.vector_store:
-            return
-        client = QdrantClient(url=self.qdrant_url)
-        self.vector_store = QdrantVectorStore(
-            client=client,
-            collection_name=self.collection_name,
-            embedding=OpenAIEmbeddings(),
+    async def index_file(self, file_path: str, progress: ProgressCallback | None = None) -> None:
+        """Index file if it changed since it was last indexed"""
+        start = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            await self._index_document(file_path, db, progress=progress)
+        RAG_INDEX_DURATION.observe(time.perf_counter() - start)
+
+    async def _similarity_search(
+        self, question: str, source: str, k: int, file_hash: str | None = None
+    ) -> list[str]:
+        """Return page content of the k chunks of source closest to question, cached per
+        file version when file_hash (of the indexed, unchanged file) is given"""
+        cache = self.retrieval_cache
+        if file_hash and (results := cache.get(source, file_hash, question)) is not None:
+            return results
+
+        query_vector = await self.embeddings.aembed_query(question)
+        similar = cache.get_similar(source, file_hash, query_vector) if file_hash else None
+        if similar is not None:
+            return similar
+
+        payloads = await self.store.search(query_vector, source, k)
+        results = [payload.get("page_content", "") for payload in payloads]
+        if file_hash:
+            cache.put(source, file_hash, question, query_vector, results)
+        return results
+
+    @staticmethod
+    def _is_current(existing: IndexedFile | None, stat: os.stat_result) -> bool:
+        """Whether file size and mtime match the indexed version"""
+        return bool(
+            existing
+            and existing.file_size == stat.st_size
+            and existing.file_mtime_ns == stat.st_mtime_ns
         )
 
-    async def _index_document(self, document_path: str, db: AsyncSession) -> None:
+    async def _detect_change(
+        self, path: Path, existing: IndexedFile | None, db: AsyncSession
+    ) -> tuple[str, os.stat_result] | None:
+        """Return new content hash and stat if path changed since indexing, else None"""
+        # Stat before hashing so a concurrent write is caught by the next check
+        stat = path.stat()
+        if self._is_current(existing, stat):
+            return None
+
+        file_hash = await asyncio.to_thread(self._calculate_hash, str(path))
+        if existing and (
+            existing.file_hash == file_hash
+            # Rows indexed before BLAKE2 hold MD5 digests
+            or (
+                len(existing.file_hash) == 32
+                and existing.file_hash
+                == await asyncio.to_thread(self._calculate_hash, str(path), "md5")
+            )
+        ):
+            # Touched but unchanged: record new stat so the next check skips hashing
+            self._record_file(existing, file_hash, stat)
+            await db.commit()
+            return None
+
+        return file_hash, stat
+
+    async def _index_document(
+        self,
+        document_path: str,
+        db: AsyncSession,
+        change: tuple[str, os.stat_result] | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> None:
         """Index document with database tracking and recursive chunking"""
         path = Path(document_path)
-        file_hash = self._calculate_hash(document_path)
-
         result = await db.execute(select(IndexedFile).where(IndexedFile.file_path == str(path)))
         existing = result.scalar_one_or_none()
 
-        if existing and existing.file_hash == file_hash:
-            logger.info(f"File unchanged, skipping: {path}")
-            return
-
-        text_content = self._load_file(document_path)
-        doc = LangchainDocument(page_content=text_content, metadata={"source": str(path)})
-
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ". ", " ", ""],
-        )
-        chunks = text_splitter.split_documents([doc])
+        if change is None:
+            change = await self._detect_change(path, existing, db)
+            if change is None:
+                logger.info(f"File unchanged, skipping: {path}")
+                return
+        file_hash, stat = change
 
-        embeddings = OpenAIEmbeddings()
-        client = QdrantClient(url=self.settings.QDRANT_URL)
+        await self.store.ensure_collection()
 
+        if existing and existing.chunk_hashes is not None:
+            indexed = set(json.loads(existing.chunk_hashes))
+        else:
+            # Without a manifest, earlier points (random ids) can't be matched: start clean
+            await self.store.delete_source(str(path))
+            indexed = set()
+
+        # Chunks are streamed and embedded a window at a time, so memory stays bounded
+        # by the window rather than the document; identical chunks share one point
+        pipeline = self._pipeline()
+        window_size = self.settings.EMBED_BATCH_SIZE * INDEX_WINDOW_BATCHES
+        seen: set[str] = set()
+        embedded: list[str] = []
         try:
-            client.create_collection(
-                collection_name=self.settings.COLLECTION_NAME,
-                vectors_config=VectorParams(size=1536, distance=Distance.COSINE),
-            )
-            logger.info(f"Created collection '{self.settings.COLLECTION_NAME}'")
-        except Exception as e:
-            logger.debug(f"Collection '{self.settings.COLLECTION_NAME}' already exists: {e}")
+            async with self._parse(document_path) as chunks:
+                # Parsing and reading chunks are blocking; keep them off the event loop
+                while window := await asyncio.to_thread(
+                    self._take_new, chunks, seen, indexed, window_size
+                ):
+                    offset = len(embedded)
+                    embedded.extend(chunk_hash for chunk_hash, _ in window)
+                    await pipeline.run(
+                        [
+                            (
+                                _point_id(str(path), chunk_hash),
+                                LangchainDocument(
+                                    page_content=chunk, metadata={"source": str(path)}
+                                ),
+                            )
+                            for chunk_hash, chunk in window
+                        ],
+                        label=path.name,
+                        progress=_offset_progress(progress, offset),
+                    )
+        except BaseException:
+            # Points of a failed run are not in any manifest; don't leave them searchable
+            if embedded:
+                with contextlib.suppress(Exception):
+                    await self.store.delete(
+                        [_point_id(str(path), chunk_hash) for chunk_hash in embedded]
+                    )
+            raise
 
-        vector_store = QdrantVectorStore(
-            client=client,
-            collection_name=self.settings.COLLECTION_NAME,
-            embedding=embeddings,
-        )
-        vector_store.add_documents(chunks)
+        stale = indexed - seen
+        if stale:
+            await self.store.delete([_point_id(str(path), chunk_hash) for chunk_hash in stale])
 
         # Track in database
-        if existing:
-            existing.file_hash = file_hash
-            existing.file_size = path.stat().st_size
-        else:
-            db.add(
-                IndexedFile(
-                    file_path=str(path),
-                    file_hash=file_hash,
-                    file_type=path.suffix,
-                    file_size=path.stat().st_size,
-                )
-            )
+        if not existing:
+            existing = IndexedFile(file_path=str(path), file_type=path.suffix)
+            db.add(existing)
+        self._record_file(existing, file_hash, stat)
+        existing.chunk_hashes = json.dumps(sorted(seen))
 
         await db.commit()
-        logger.info(f"Indexed {len(chunks)} chunks from '{path}'")
+        # Results of earlier versions can no longer be hit; free them
+        self.retrieval_cache.invalidate(str(path))
+        logger.info(
+            f"Indexed {len(seen)} chunks from '{path}' "
+            f"({len(embedded)} embedded, {len(stale)} removed)"
+        )
+
+    @contextlib.asynccontextmanager
+    async def _parse(self, document_path: str) -> AsyncIterator[Iterator[tuple[str, str]]]:
+        """Stream (hash, chunk) pairs of a document, parsed in a child process if enabled"""
+        if pool := get_parsing_pool():
+            async with pool.parse(document_path) as chunks:
+                yield chunks
+            return
 
-    def _calculate_hash(self, file_path: str) -> str:
-        """Calculate MD5 hash of file to detect changes"""
+        # Parsed lazily in threads of this worker (scripts, or PARSE_WORKERS=0)
+        chunks = iter_chunks(document_path)
+        try:
+            yield chunks
+        finally:
+            # Still running in its thread if we were cancelled mid-window
+            with contextlib.suppress(ValueError):
+                chunks.close()
+
+    @staticmethod
+    def _take_new(
+        chunks: Iterator[tuple[str, str]], seen: set[str], indexed: set[str], limit: int
+    ) -> list[tuple[str, str]]:
+        """Pull up to limit unseen, unindexed (hash, chunk) pairs; empty when exhausted"""
+        window = []
+        for chunk_hash, chunk in chunks:
+            if chunk_hash in seen:
+                continue
+            seen.add(chunk_hash)
+            if chunk_hash not in indexed:
+                window.append((chunk_hash, chunk))
+                if len(window) >= limit:
+                    break
+        return window
+
+    def _record_file(self, indexed: IndexedFile, file_hash: str, stat: os.stat_result) -> None:
+        """Store content hash and the stat it was computed for"""
+        indexed.file_hash = file_hash
+        indexed.file_size = stat.st_size
+        indexed.file_mtime_ns = stat.st_mtime_ns
+
+    def _calculate_hash(self, file_path: str, algorithm: str = "blake2b") -> str:
+        """Hash file in fixed-size blocks to detect changes (constant memory)"""
         with open(file_path, "rb") as f:
-            return hashlib.md5(f.read()).hexdigest()
-
-    def _load_file(self, file_path: str) -> str:
-        """Load text from various file types"""
-        path = Path(file_path)
-        suffix = path.suffix.lower()
-
-        if suffix == ".docx":
-            doc = DocxDocument(file_path)
-            return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-
-        elif suffix == ".pdf":
-            reader = PdfReader(file_path)
-            text = []
-            for page in reader.pages:
-                if page_text := page.extract_text():
-                    text.append(page_text)
-            return "\n\n".join(text) if text else ""
-
-        elif suffix == ".xlsx":
-            workbook = load_workbook(file_path, data_only=True)
-            text = []
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                text.append(f"Sheet: {sheet_name}\n")
-                for row in sheet.iter_rows(values_only=True):
-                    row_text = "\t".join(str(cell) if cell is not None else "" for cell in row)
-                    if row_text.strip():
-                        text.append(row_text)
-            return "\n".join(text) if text else ""
-
-        elif suffix == ".pptx":
-            prs = Presentation(file_path)
-            text = []
-            for i, slide in enumerate(prs.slides, 1):
-                text.append(f"Slide {i}:")
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        text.append(shape.text)
-            return "\n\n".join(text) if text else ""
+            return hashlib.file_digest(f, algorithm).hexdigest()
 
-        else:
-            try:
-                return path.read_text(encoding="utf-8")
-            except UnicodeDecodeError as e:
-                raise ValueError(
-                    f"File is not a supported format or has unsupported encoding: {file_path}"
-                ) from e
+
+_service: RAGService | None = None
+
+
+def get_rag_service() -> RAGService:
+    """Get the worker's RAG service (vector store and embeddings clients), created on first use"""
+    global _service
+    if _service is None:
+        _service = RAGService()
+    return _service
+
+
+def set_rag_service(service: RAGService | None) -> None:
+    """Install the worker's RAG service"""
+    global _service
+    _service = service
@@ -0,0 +1,126 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from app.backend.metrics import RETRIEVAL_CACHE
+
+# (file path, content hash of the indexed version, normalized question)
+CacheKey = tuple[str, str, str]
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase words of a question, ignoring punctuation and spacing"""
+    return " ".join(re.findall(r"\w+", question.lower()))
+
+
+class _Entry:
+    __slots__ = ("results", "vector", "expires_at")
+
+    def __init__(self, results: list[str], vector: np.ndarray, expires_at: float):
+        self.results = results
+        self.vector = vector
+        self.expires_at = expires_at
+
+
+class RetrievalCache:
+    """LRU of search results per file version and question, with a TTL. With a similarity
+    threshold, a question whose embedding is that close to a cached question of the same
+    file version reuses its results"""
+
+    def __init__(self, max_entries: int, ttl_s: float, similarity: float = 0.0):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.similarity = similarity
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        # Keys per file path, for the semantic tier and invalidation
+        self._by_path: dict[str, set[CacheKey]] = {}
+        self._stats = {"exact": {"hits": 0, "misses": 0}, "semantic": {"hits": 0, "misses": 0}}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def stats(self) -> dict[str, Any]:
+        """Hits, misses and hit ratio per tier"""
+        return {
+            tier: {
+                **counts,
+                "hit_rate": (
+                    round(counts["hits"] / (counts["hits"] + counts["misses"]), 3)
+                    if counts["hits"] + counts["misses"]
+                    else None
+                ),
+            }
+            for tier, counts in self._stats.items()
+        } | {"size": len(self._entries)}
+
+    def get(self, path: str, file_hash: str, question: str) -> list[str] | None:
+        """Cached results of the same question about this file version"""
+        if not self.enabled:
+            return None
+        key = (path, file_hash, normalize_question(question))
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+        self._count("exact", entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry.results
+
+    def get_similar(self, path: str, file_hash: str, vector: list[float]) -> list[str] | None:
+        """Cached results of the closest question about this file version, if close enough"""
+        if not self.enabled or self.similarity <= 0:
+            return None
+        query = self._unit(vector)
+        now = time.monotonic()
+        best_key, best_score = None, self.similarity
+        for key in list(self._by_path.get(path, ())):
+            entry = self._entries[key]
+            if entry.expires_at <= now:
+                self._remove(key)
+            elif key[1] == file_hash and (score := float(entry.vector @ query)) >= best_score:
+                best_key, best_score = key, score
+        self._count("semantic", best_key is not None)
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key].results
+
+    def put(
+        self, path: str, file_hash: str, question: str, vector: list[float], results: list[str]
+    ) -> None:
+        """Cache results of a question about this file version"""
+        if not self.enabled:
+            return
+        key = (path, file_hash, normalize_question(question))
+        self._entries[key] = _Entry(results, self._unit(vector), time.monotonic() + self.ttl_s)
+        self._entries.move_to_end(key)
+        self._by_path.setdefault(path, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path: str) -> None:
+        """Drop results of every version of a file"""
+        for key in list(self._by_path.get(path, ())):
+            self._remove(key)
+
+    def _remove(self, key: CacheKey) -> None:
+        del self._entries[key]
+        keys = self._by_path[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._by_path[key[0]]
+
+    def _count(self, tier: str, hit: bool) -> None:
+        self._stats[tier]["hits" if hit else "misses"] += 1
+        RETRIEVAL_CACHE.inc(tier=tier, result="hit" if hit else "miss")
+
+    @staticmethod
+    def _unit(vector: list[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        return array / (np.linalg.norm(array) or 1)
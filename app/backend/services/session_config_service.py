@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import json
+from urllib.parse import quote
+
+import asyncpg
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.config import get_settings
+from app.backend.constants.prompts import INSTRUCTIONS
+from app.backend.database.models import Prompt, Settings
+from app.backend.database.session import AsyncSessionLocal
+from app.backend.logger import get_logger
+from app.backend.services.settings_service import SettingsService
+from app.backend.services.tool_service import ToolService
+from app.backend.services.voice.pool import get_realtime_pool
+
+logger = get_logger(__name__)
+
+# Postgres NOTIFY channel shared by all workers
+CONFIG_CHANNEL = "voice_agent_config_changed"
+LISTEN_RETRY_S = 5
+
+
+class SessionConfig:
+    def __init__(self, user_settings: dict, instructions: str, custom_prompt: bool):
+        self.user_settings = user_settings
+        self.instructions = instructions
+        self.custom_prompt = custom_prompt
+
+
+# Worker-wide cache of the resolved session config
+_cached: SessionConfig | None = None
+_generation = 0
+_lock = asyncio.Lock()
+
+
+class SessionConfigService:
+    @staticmethod
+    async def get() -> SessionConfig:
+        """Get fully resolved session config (settings merged with defaults, prompt)"""
+        global _cached
+
+        if _cached is not None:
+            return _cached
+
+        async with _lock:
+            if _cached is not None:
+                return _cached
+
+            generation = _generation
+            config = await SessionConfigService.load()
+            # A build raced by invalidation may be stale, so serve it without caching
+            if generation == _generation:
+                _cached = config
+            return config
+
+    @staticmethod
+    async def load() -> SessionConfig:
+        """Load settings and prompt from database"""
+        async with AsyncSessionLocal() as db:
+            default_schema = SettingsService.load_default_settings()
+
+            settings_result = await db.execute(select(Settings).limit(1))
+            custom_settings = settings_result.scalar_one_or_none()
+
+            if custom_settings:
+                custom_backend = json.loads(custom_settings.backend_settings)
+                custom_client = json.loads(custom_settings.client_settings)
+                backend = SettingsService.merge_settings(
+                    default_schema.get("backend", {}), custom_backend
+                )
+                client = SettingsService.merge_settings(
+                    default_schema.get("client", {}), custom_client
+                )
+            else:
+                backend = default_schema.get("backend", {})
+                client = default_schema.get("client", {})
+
+            user_settings = {"backend": backend, "client": client}
+
+            prompt_result = await db.execute(select(Prompt).limit(1))
+            active_prompt = prompt_result.scalar_one_or_none()
+            instructions = active_prompt.content if active_prompt else INSTRUCTIONS
+
+            return SessionConfig(user_settings, instructions, active_prompt is not None)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop this worker's cached session config, tool registry and pre-warmed connections"""
+        global _cached, _generation
+        _cached = None
+        _generation += 1
+        ToolService.invalidate_registry()
+        if pool := get_realtime_pool():
+            pool.invalidate()
+
+    @staticmethod
+    async def notify_changed(db: AsyncSession) -> None:
+        """Write pending changes, then queue change notification for all workers in the
+        same transaction (delivered when db commits)"""
+        await db.flush()
+        await db.execute(text("SELECT pg_notify(:channel, '')"), {"channel": CONFIG_CHANNEL})
+
+    @staticmethod
+    async def listen() -> None:
+        """Invalidate cache on change notifications from any worker (runs until cancelled)"""
+        # asyncpg expects a plain postgresql:// DSN and percent-decodes credentials
+        # (quote_plus would turn spaces into literal "+")
+        settings = get_settings()
+        dsn = (
+            f"postgresql://{quote(settings.POSTGRES_USER, safe='')}:"
+            f"{quote(settings.POSTGRES_PASSWORD, safe='')}"
+            f"@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+        )
+
+        while True:
+            try:
+                await SessionConfigService._listen_once(dsn)
+                logger.warning("Config change listener disconnected")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Config change listener failed: {e}")
+
+            await asyncio.sleep(LISTEN_RETRY_S)
+
+    @staticmethod
+    async def _listen_once(dsn: str) -> None:
+        """Hold one LISTEN connection until it drops"""
+        conn = await asyncpg.connect(dsn)
+        try:
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            await conn.add_listener(
+                CONFIG_CHANNEL, lambda *_args: SessionConfigService.invalidate()
+            )
+
+            # Changes may have been missed while not listening
+            SessionConfigService.invalidate()
+            logger.info(f"Listening for config changes on '{CONFIG_CHANNEL}'")
+            await closed.wait()
+        finally:
+            if not conn.is_closed():
+                with contextlib.suppress(Exception):
+                    await conn.close()
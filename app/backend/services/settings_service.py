@@ -1,17 +1,26 @@
+import copy
+import functools
 import json
 from pathlib import Path
 
 
+@functools.cache
+def _read_schema_file() -> dict:
+    """Read and parse schema file once per process"""
+    schema_file = Path(__file__).parent.parent / "constants" / "settings_schema.json"
+    try:
+        with open(schema_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"backend": {}, "client": {}}
+
+
 class SettingsService:
     @staticmethod
     def load_default_settings() -> dict:
         """Load default settings from schema file"""
-        schema_file = Path(__file__).parent.parent / "constants" / "settings_schema.json"
-        try:
-            with open(schema_file, encoding="utf-8") as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {"backend": {}, "client": {}}
+        # Callers may mutate the result, so hand out a copy of the parsed schema
+        return copy.deepcopy(_read_schema_file())
 
     @staticmethod
     def ensure_value_field(schema_section):
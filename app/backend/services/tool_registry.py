@@ -0,0 +1,39 @@
+from typing import Any
+
+from langchain_core.tools import BaseTool
+
+
+class ToolRegistry:
+    def __init__(self, tools: list[BaseTool]):
+        self.tools = tools
+        self.by_name: dict[str, BaseTool] = {t.name: t for t in tools}
+        self.schemas: list[dict[str, Any]] = [
+            {
+                "type": "function",
+                "name": t.name,
+                "description": t.description,
+                "parameters": get_tool_parameters(t),
+            }
+            for t in tools
+        ]
+
+    def __len__(self) -> int:
+        """Number of enabled tools"""
+        return len(self.tools)
+
+    def get(self, name: str | None) -> BaseTool | None:
+        """Look up tool by name"""
+        return self.by_name.get(name) if name else None
+
+
+def get_tool_parameters(tool: BaseTool) -> dict[str, Any]:
+    """Extract tool parameters for OpenAI format"""
+    if tool.args_schema is None:
+        return {"type": "object", "properties": {}, "required": []}
+
+    schema = tool.args_schema.model_json_schema()
+    return {
+        "type": "object",
+        "properties": schema.get("properties", {}),
+        "required": schema.get("required", []),
+    }
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 
 from langchain_community.tools import DuckDuckGoSearchResults
@@ -16,17 +17,17 @@ from app.backend.constants.descriptions import (
 from app.backend.database.models import Tool
 from app.backend.database.session import AsyncSessionLocal
 from app.backend.logger import get_logger
-from app.backend.services.rag_service import RAGService
+from app.backend.services.rag_service import get_rag_service
+from app.backend.services.tool_registry import ToolRegistry
 
 logger = get_logger(__name__)
 
 
 @tool(description=SEARCH_IN_FILE_DESCRIPTION)
-def search_in_file(file_path: str, question: str) -> str:
+async def search_in_file(file_path: str, question: str) -> str:
     """Search semantic content within a specific file"""
     try:
-        rag = RAGService()
-        return rag.search_in_file(file_path, question)
+        return await get_rag_service().search_in_file(file_path, question)
     except Exception as e:
         logger.error(f"Failed to search in {file_path}: {e}")
         return f"Error: {str(e)}"
@@ -126,6 +127,12 @@ TOOL_GROUPS = {
 }
 
 
+# Process-wide registry, rebuilt lazily after tool settings change
+_registry: ToolRegistry | None = None
+_registry_generation = 0
+_registry_lock = asyncio.Lock()
+
+
 class ToolService:
     @staticmethod
     async def get_search_tools() -> list[BaseTool]:
@@ -151,16 +158,48 @@ class ToolService:
         return [DuckDuckGoSearchResults(num_results=5, description=SEARCH_DESCRIPTION)]
 
     @staticmethod
-    async def get_all_tools() -> list[BaseTool]:
-        """Get all enabled tools with custom descriptions"""
+    async def get_registry() -> ToolRegistry:
+        """Get shared registry of enabled tools with prebuilt OpenAI schemas"""
+        global _registry
+
+        if _registry is not None:
+            return _registry
+
+        async with _registry_lock:
+            if _registry is not None:
+                return _registry
+
+            generation = _registry_generation
+            db_tools = await ToolService._get_db_tools()
+            registry = ToolRegistry(await ToolService._build_tools(db_tools or {}))
+
+            # Don't cache defaults from a failed DB read or a build raced by invalidation
+            if db_tools is not None and generation == _registry_generation:
+                _registry = registry
+                logger.info(f"Tool registry built ({len(registry)} tools)")
+            return registry
+
+    @staticmethod
+    def invalidate_registry() -> None:
+        """Drop shared registry so the next session rebuilds it"""
+        global _registry, _registry_generation
+        _registry = None
+        _registry_generation += 1
+
+    @staticmethod
+    async def _get_db_tools() -> dict[str, Tool] | None:
+        """Fetch tool statuses from database (None if unavailable)"""
         try:
             async with AsyncSessionLocal() as db:
                 result = await db.execute(select(Tool))
-                db_tools = {t.name: t for t in result.scalars().all()}
+                return {t.name: t for t in result.scalars().all()}
         except Exception as e:
             logger.warning(f"Failed to fetch tool statuses: {e}")
-            db_tools = {}
+            return None
 
+    @staticmethod
+    async def _build_tools(db_tools: dict[str, Tool]) -> list[BaseTool]:
+        """Instantiate enabled tools, applying custom descriptions"""
         tools = []
         for tool_name, tool_config in TOOL_GROUPS.items():
             db_tool = db_tools.get(tool_name)
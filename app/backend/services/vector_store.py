@@ -0,0 +1,514 @@
+import asyncio
+import json
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Protocol
+
+import httpx
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
+
+from app.backend.config import Settings
+from app.backend.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: the data directory is not locked
+    fcntl = None
+
+try:
+    import hnswlib
+except ImportError:  # optional extra: pip install .[hnsw]
+    hnswlib = None
+
+logger = get_logger(__name__)
+
+# Dimensions of text-embedding-ada-002 / text-embedding-3-small
+EMBEDDING_SIZE = 1536
+
+# Local index: initial slots, and journal entries per live point that trigger compaction
+INITIAL_CAPACITY = 1024
+COMPACT_RATIO = 2
+# Rows gathered per matrix-vector product when a file's slots are scattered
+SCORE_BLOCK_ROWS = 1024
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 100
+HNSW_EF_SEARCH = 64
+
+
+class VectorStore(Protocol):
+    """Vector index of document chunks; payloads follow the langchain layout
+    {"page_content": ..., "metadata": {"source": ...}}"""
+
+    async def ensure_collection(self) -> None:
+        """Create the collection if it doesn't exist"""
+        ...
+
+    async def upsert(
+        self, ids: list[str], vectors: list[list[float]], payloads: list[dict[str, Any]]
+    ) -> None:
+        """Insert or replace points"""
+        ...
+
+    async def delete(self, ids: list[str]) -> None:
+        """Delete points by id"""
+        ...
+
+    async def delete_source(self, source: str) -> None:
+        """Delete all points of a source file"""
+        ...
+
+    async def search(self, vector: list[float], source: str, k: int) -> list[dict[str, Any]]:
+        """Payloads of the k points of source closest to vector (cosine); empty before the
+        collection exists"""
+        ...
+
+    async def close(self) -> None:
+        """Release connections and files"""
+        ...
+
+
+def _source_filter(source: str) -> models.Filter:
+    """Filter matching all points of a source file"""
+    return models.Filter(
+        must=[models.FieldCondition(key="metadata.source", match=models.MatchValue(value=source))]
+    )
+
+
+class QdrantVectorStore:
+    """Collection on a Qdrant server"""
+
+    def __init__(self, client: AsyncQdrantClient, collection_name: str):
+        self.client = client
+        self.collection_name = collection_name
+        # Set once the collection is known to exist with the expected schema
+        self._ready = False
+        self._ready_lock = asyncio.Lock()
+
+    async def ensure_collection(self) -> None:
+        """Create the collection or check its schema, once per store"""
+        if self._ready:
+            return
+        async with self._ready_lock:
+            if self._ready:
+                return
+
+            if await self.client.collection_exists(self.collection_name):
+                info = await self.client.get_collection(self.collection_name)
+                vectors = info.config.params.vectors
+                if not (
+                    isinstance(vectors, models.VectorParams)
+                    and vectors.size == EMBEDDING_SIZE
+                    and vectors.distance == models.Distance.COSINE
+                ):
+                    raise ValueError(
+                        f"Collection '{self.collection_name}' has vectors {vectors}, "
+                        f"expected {EMBEDDING_SIZE}-dimensional cosine"
+                    )
+                indexed = "metadata.source" in (info.payload_schema or {})
+            else:
+                try:
+                    await self.client.create_collection(
+                        collection_name=self.collection_name,
+                        vectors_config=models.VectorParams(
+                            size=EMBEDDING_SIZE, distance=models.Distance.COSINE
+                        ),
+                    )
+                    logger.info(f"Created collection '{self.collection_name}'")
+                except Exception:
+                    # Another worker process may have created it first
+                    if not await self.client.collection_exists(self.collection_name):
+                        raise
+                indexed = False
+
+            # Every search filters by source
+            if not indexed:
+                await self.client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name="metadata.source",
+                    field_schema=models.PayloadSchemaType.KEYWORD,
+                )
+            self._ready = True
+
+    async def upsert(
+        self, ids: list[str], vectors: list[list[float]], payloads: list[dict[str, Any]]
+    ) -> None:
+        try:
+            await self.client.upsert(
+                collection_name=self.collection_name,
+                points=[
+                    models.PointStruct(id=point_id, vector=vector, payload=payload)
+                    for point_id, vector, payload in zip(ids, vectors, payloads, strict=True)
+                ],
+            )
+        except Exception:
+            # The collection may have been dropped: check again on the next indexing run
+            self._ready = False
+            raise
+
+    async def delete(self, ids: list[str]) -> None:
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.PointIdsList(points=ids),
+        )
+
+    async def delete_source(self, source: str) -> None:
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(filter=_source_filter(source)),
+        )
+
+    async def search(self, vector: list[float], source: str, k: int) -> list[dict[str, Any]]:
+        try:
+            response = await self.client.query_points(
+                collection_name=self.collection_name,
+                query=vector,
+                query_filter=_source_filter(source),
+                limit=k,
+                with_payload=True,
+            )
+        except Exception:
+            # Nothing is searchable until the first indexing job creates the collection
+            if await self.client.collection_exists(self.collection_name):
+                raise
+            return []
+        return [point.payload or {} for point in response.points]
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class LocalVectorStore:
+    """In-process index persisted under a directory, for single-worker deployments.
+
+    Unit vectors live in a memory-mapped float32 array (one row per slot); ids and
+    payloads are replayed from an append-only journal, with slots indexed by source so a
+    search only scores that file's rows. Sources with at least hnsw_min_points points are
+    searched through an HNSW graph when hnswlib is installed.
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path,
+        collection_name: str,
+        size: int = EMBEDDING_SIZE,
+        hnsw_min_points: int = 20_000,
+    ):
+        self.path = Path(data_dir).expanduser() / collection_name
+        self.size = size
+        self.hnsw_min_points = hnsw_min_points
+        self._lock = threading.Lock()
+        self._opened = False
+
+    async def ensure_collection(self) -> None:
+        await asyncio.to_thread(self._locked, lambda: None)
+
+    async def upsert(
+        self, ids: list[str], vectors: list[list[float]], payloads: list[dict[str, Any]]
+    ) -> None:
+        await asyncio.to_thread(self._locked, self._upsert, ids, vectors, payloads)
+
+    async def delete(self, ids: list[str]) -> None:
+        await asyncio.to_thread(self._locked, self._delete, ids)
+
+    async def delete_source(self, source: str) -> None:
+        await asyncio.to_thread(
+            self._locked,
+            lambda: self._delete([self._ids[slot] for slot in self._by_source.get(source, ())]),
+        )
+
+    async def search(self, vector: list[float], source: str, k: int) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._locked, self._search, vector, source, k)
+
+    async def close(self) -> None:
+        """Compact the journal, save the HNSW graph and unlock the directory; reopened on use"""
+        await asyncio.to_thread(self._close)
+
+    def _locked(self, func, *args):
+        """Run func with the index loaded, holding the lock"""
+        with self._lock:
+            if not self._opened:
+                self._open()
+            return func(*args)
+
+    def _open(self) -> None:
+        """Lock the directory and load the index"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock_fd = os.open(self.path / ".lock", os.O_RDWR | os.O_CREAT)
+        if fcntl:
+            try:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(self._lock_fd)
+                raise RuntimeError(
+                    f"Vector index {self.path} is in use by another process; "
+                    "the local vector backend supports a single worker process"
+                ) from None
+
+        self._ids: list[str | None] = []
+        self._payloads: list[dict[str, Any] | None] = []
+        self._slots: dict[str, int] = {}
+        self._by_source: dict[str, set[int]] = {}
+        self._entries = 0
+        journal = self.path / "points.jsonl"
+        if journal.exists():
+            with open(journal, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final write of a crashed process
+                        continue
+                    self._entries += 1
+                    if entry.get("deleted"):
+                        self._remove(entry["id"])
+                    else:
+                        self._place(entry["id"], entry["slot"], entry["payload"])
+        self._free = [slot for slot, point_id in enumerate(self._ids) if point_id is None]
+
+        vectors = self.path / "vectors.f32"
+        rows = vectors.stat().st_size // (4 * self.size) if vectors.exists() else 0
+        capacity = max(INITIAL_CAPACITY, rows, len(self._ids))
+        self._vectors = self._map(capacity)
+        self._opened = True
+
+        self._hnsw = None
+        self._hnsw_dirty = False
+        if hnswlib and len(self._slots) >= self.hnsw_min_points:
+            self._load_hnsw()
+        logger.info(f"Opened local vector index {self.path} ({len(self._slots)} points)")
+
+    def _close(self) -> None:
+        with self._lock:
+            if not self._opened:
+                return
+            if self._entries > COMPACT_RATIO * len(self._slots) + INITIAL_CAPACITY:
+                self._compact()
+            if self._hnsw is not None and self._hnsw_dirty:
+                self._save_hnsw()
+            self._vectors.flush()
+            del self._vectors
+            os.close(self._lock_fd)
+            self._hnsw = None
+            self._opened = False
+
+    def _map(self, capacity: int) -> np.memmap:
+        """Map the vector file, growing it to capacity rows"""
+        path = self.path / "vectors.f32"
+        with open(path, "ab") as f:
+            if f.tell() < capacity * self.size * 4:
+                f.truncate(capacity * self.size * 4)
+        return np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, self.size))
+
+    def _place(self, point_id: str, slot: int, payload: dict[str, Any]) -> None:
+        """Record point at slot in the in-memory tables"""
+        self._remove(point_id)
+        if slot >= len(self._ids):
+            self._ids.extend([None] * (slot + 1 - len(self._ids)))
+            self._payloads.extend([None] * (slot + 1 - len(self._payloads)))
+        self._ids[slot] = point_id
+        self._payloads[slot] = payload
+        self._slots[point_id] = slot
+        source = payload.get("metadata", {}).get("source")
+        self._by_source.setdefault(source, set()).add(slot)
+
+    def _remove(self, point_id: str) -> int | None:
+        """Drop point from the in-memory tables, returning its freed slot"""
+        slot = self._slots.pop(point_id, None)
+        if slot is None:
+            return None
+        source = self._payloads[slot].get("metadata", {}).get("source")
+        slots = self._by_source[source]
+        slots.discard(slot)
+        if not slots:
+            del self._by_source[source]
+        self._ids[slot] = None
+        self._payloads[slot] = None
+        return slot
+
+    def _upsert(
+        self, ids: list[str], vectors: list[list[float]], payloads: list[dict[str, Any]]
+    ) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+
+        slots = []
+        reserved: dict[str, int] = {}
+        for point_id in ids:
+            slot = self._slots.get(point_id, reserved.get(point_id))
+            if slot is None:
+                slot = self._free.pop() if self._free else len(self._ids)
+                # Reserve the slot until the batch is placed
+                if slot == len(self._ids):
+                    self._ids.append(None)
+                    self._payloads.append(None)
+                reserved[point_id] = slot
+            slots.append(slot)
+
+        if len(self._ids) > len(self._vectors):
+            self._grow(max(len(self._ids), 2 * len(self._vectors)))
+        self._vectors[slots] = matrix
+        # Vectors reach the file before the journal refers to them
+        self._vectors.flush()
+
+        for point_id, slot, payload in zip(ids, slots, payloads, strict=True):
+            self._place(point_id, slot, payload)
+        self._append(
+            {"id": point_id, "slot": slot, "payload": payload}
+            for point_id, slot, payload in zip(ids, slots, payloads, strict=True)
+        )
+
+        if self._hnsw is not None:
+            self._hnsw.add_items(matrix, slots)
+            self._hnsw_dirty = True
+        elif hnswlib and len(self._slots) >= self.hnsw_min_points:
+            self._build_hnsw()
+
+    def _delete(self, ids: list[str]) -> None:
+        deleted = []
+        for point_id in ids:
+            slot = self._remove(point_id)
+            if slot is None:
+                continue
+            self._free.append(slot)
+            deleted.append({"id": point_id, "deleted": True})
+            if self._hnsw is not None:
+                self._hnsw.mark_deleted(slot)
+                self._hnsw_dirty = True
+        self._append(deleted)
+
+    def _search(self, vector: list[float], source: str, k: int) -> list[dict[str, Any]]:
+        slots = self._by_source.get(source)
+        if not slots or k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1
+        k = min(k, len(slots))
+
+        if self._hnsw is not None and len(slots) >= self.hnsw_min_points:
+            self._hnsw.set_ef(max(HNSW_EF_SEARCH, k))
+            try:
+                labels, _ = self._hnsw.knn_query(
+                    query, k=k, num_threads=1, filter=slots.__contains__
+                )
+                return [self._payloads[slot] for slot in labels[0]]
+            except RuntimeError as e:
+                # Fewer than k matches reachable in the graph: score exactly instead
+                logger.debug(f"HNSW search of {source} fell back to exact scoring: {e}")
+
+        rows = np.fromiter(slots, dtype=np.int64, count=len(slots))
+        rows.sort()
+        scores = np.empty(len(rows), dtype=np.float32)
+        runs = np.flatnonzero(np.diff(rows) != 1) + 1
+        if len(runs) <= len(rows) // SCORE_BLOCK_ROWS:
+            # A file's points are mostly in consecutive slots: score views of the map
+            for start, end in zip([0, *runs], [*runs, len(rows)], strict=True):
+                vectors = self._vectors[rows[start] : rows[end - 1] + 1]
+                np.dot(vectors, query, out=scores[start:end])
+        else:
+            # Scattered: gather a block at a time so the copy stays cache-sized
+            for i in range(0, len(rows), SCORE_BLOCK_ROWS):
+                block = rows[i : i + SCORE_BLOCK_ROWS]
+                np.dot(self._vectors[block], query, out=scores[i : i + len(block)])
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        return [self._payloads[slot] for slot in rows[top]]
+
+    def _append(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Append entries to the journal"""
+        with open(self.path / "points.jsonl", "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+                self._entries += 1
+
+    def _grow(self, capacity: int) -> None:
+        self._vectors.flush()
+        del self._vectors
+        self._vectors = self._map(capacity)
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _compact(self) -> None:
+        """Rewrite the journal with live points only"""
+        journal = self.path / "points.jsonl"
+        temporary = journal.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            for point_id, slot in self._slots.items():
+                f.write(
+                    json.dumps({"id": point_id, "slot": slot, "payload": self._payloads[slot]})
+                    + "\n"
+                )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, journal)
+        self._entries = len(self._slots)
+        # A saved graph is matched to the journal by entry count, which just changed
+        for stale in self.path.glob("hnsw-*.bin"):
+            stale.unlink()
+        self._hnsw_dirty = self._hnsw is not None
+
+    def _hnsw_file(self) -> Path:
+        """Saved graph of the current journal state"""
+        return self.path / f"hnsw-{self._entries}.bin"
+
+    def _load_hnsw(self) -> None:
+        path = self._hnsw_file()
+        if not path.exists():
+            self._build_hnsw()
+            return
+        self._hnsw = hnswlib.Index(space="ip", dim=self.size)
+        try:
+            self._hnsw.load_index(str(path), max_elements=len(self._vectors))
+            self._hnsw_dirty = False
+        except RuntimeError as e:
+            logger.warning(f"Rebuilding unreadable HNSW graph {path}: {e}")
+            self._build_hnsw()
+
+    def _build_hnsw(self) -> None:
+        """Build the graph from all live vectors"""
+        rows = np.fromiter(self._slots.values(), dtype=np.int64, count=len(self._slots))
+        logger.info(f"Building HNSW graph of {len(rows)} points in {self.path}")
+        self._hnsw = hnswlib.Index(space="ip", dim=self.size)
+        self._hnsw.init_index(
+            max_elements=len(self._vectors), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M
+        )
+        self._hnsw.add_items(self._vectors[rows], rows)
+        self._hnsw_dirty = True
+
+    def _save_hnsw(self) -> None:
+        for stale in self.path.glob("hnsw-*.bin"):
+            stale.unlink()
+        self._hnsw.save_index(str(self._hnsw_file()))
+        self._hnsw_dirty = False
+
+
+# Local indexes are shared within the process: the directory lock admits one opener
+_local_stores: dict[tuple[Path, str], LocalVectorStore] = {}
+
+
+def create_vector_store(settings: Settings) -> VectorStore:
+    """Vector store of the configured backend"""
+    if settings.VECTOR_BACKEND == "local":
+        key = (Path(settings.VECTOR_DATA_DIR).expanduser().resolve(), settings.COLLECTION_NAME)
+        if key not in _local_stores:
+            _local_stores[key] = LocalVectorStore(
+                *key, hnsw_min_points=settings.VECTOR_HNSW_MIN_POINTS
+            )
+        return _local_stores[key]
+
+    if not settings.QDRANT_URL:
+        raise ValueError("QDRANT_URL is required when VECTOR_BACKEND is 'qdrant'")
+    client = AsyncQdrantClient(
+        url=settings.QDRANT_URL,
+        prefer_grpc=settings.QDRANT_PREFER_GRPC,
+        grpc_port=settings.QDRANT_GRPC_PORT,
+        # qdrant-client disables keep-alive for localhost unless limits are given
+        limits=httpx.Limits(
+            max_connections=settings.QDRANT_POOL_SIZE,
+            max_keepalive_connections=settings.QDRANT_POOL_SIZE,
+        ),
+    )
+    return QdrantVectorStore(client, settings.COLLECTION_NAME)
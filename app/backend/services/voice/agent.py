@@ -1,18 +1,104 @@
+import asyncio
+import base64
 import json
-from collections.abc import Callable
+import time
+import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime
+from functools import partial
 from typing import Any, TypedDict
 
 import websockets
-from langchain_core.tools import BaseTool
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
+from websockets.asyncio.client import ClientConnection
 
 from app.backend.logger import get_logger
+from app.backend.metrics import (
+    ERRORS,
+    EVENTS,
+    REGISTRY,
+    SPEECH_TO_AUDIO,
+    SPEECH_TO_RESPONSE,
+    TOOL_DURATION,
+    Counter,
+    Gauge,
+)
+from app.backend.services.tool_registry import ToolRegistry
+from app.backend.services.voice.events import EventRegistry
+from app.backend.services.voice.outbound import AudioPolicy, OutboundQueue
+from app.backend.services.voice.pool import RealtimeConnectionPool
+from app.backend.services.voice.recorder import (
+    BROWSER_IN,
+    BROWSER_OUT,
+    LOCAL,
+    UPSTREAM_IN,
+    UPSTREAM_OUT,
+    FlightRecorder,
+)
 from app.backend.services.voice.transcription import TranscriptionBuffer
 
 logger = get_logger(__name__)
 
+DEFAULT_REALTIME_URL = "wss://api.openai.com/v1/realtime"
+
+# Realtime API serializes "type" first, so events can be recognized by prefix
+_TYPE_PREFIX = '{"type":"'
+_AUDIO_DELTA_PREFIX = '{"type":"response.audio.delta"'
+_DELTA_FIELD = '"delta":"'
+
+
+def _sniff_event_type(raw_event: str | bytes) -> str | None:
+    """Return event type from the serialized prefix without parsing the JSON"""
+    if not isinstance(raw_event, str) or not raw_event.startswith(_TYPE_PREFIX):
+        return None
+
+    end = raw_event.find('"', len(_TYPE_PREFIX))
+    if end == -1:
+        return None
+    return raw_event[len(_TYPE_PREFIX) : end]
+
+
+def _extract_audio_delta(raw_event: str | bytes) -> str | None:
+    """Return base64 payload of a response.audio.delta event without parsing the JSON"""
+    if not isinstance(raw_event, str) or not raw_event.startswith(_AUDIO_DELTA_PREFIX):
+        return None
+
+    start = raw_event.find(_DELTA_FIELD)
+    if start == -1:
+        return None
+    start += len(_DELTA_FIELD)
+
+    end = raw_event.find('"', start)
+    if end == -1:
+        return None
+
+    delta = raw_event[start:end]
+    # Base64 never contains escapes; anything else goes through the regular parser
+    if "\\" in delta:
+        return None
+    return delta
+
+
+async def open_realtime_connection(
+    model: str, api_key: str, url: str = DEFAULT_REALTIME_URL
+) -> ClientConnection:
+    """Open WebSocket connection to OpenAI Realtime API (or a compatible endpoint)"""
+    return await websockets.connect(
+        f"{url}?model={model}",
+        additional_headers={
+            "Authorization": f"Bearer {api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        },
+    )
+
+
+def extract_value(setting: Any, fallback: Any) -> Any:
+    """Extract value from schema-structured setting"""
+    if isinstance(setting, dict):
+        return setting.get("value", setting.get("default", fallback))
+    return setting if setting is not None else fallback
+
 
 class AgentState(TypedDict):
     tool_calls: list[dict[str, Any]]
@@ -20,290 +106,488 @@ class AgentState(TypedDict):
 
 
 class VoiceAgent:
+    # Upstream event type -> handler; other modules may register into it
+    events = EventRegistry()
+
     def __init__(
         self,
         model: str,
         api_key: str,
         user_settings: dict[str, Any],
         instructions: str,
-        tools: list[BaseTool] | None = None,
+        tools: ToolRegistry | None = None,
+        binary_audio: bool = False,
+        outbound_queue_size: int = 256,
+        outbound_audio_policy: AudioPolicy = "block",
+        session_id: str | None = None,
+        flight_recorder_size: int = 2048,
+        realtime_url: str = DEFAULT_REALTIME_URL,
     ):
         self.model = model
         self.api_key = api_key
+        self.realtime_url = realtime_url
         self.user_settings = user_settings
         self.instructions = instructions
-        self.tools = tools or []
-        self.ws: websockets.WebSocketClientProtocol | None = None
+        self.tools = tools or ToolRegistry([])
+        self.binary_audio = binary_audio
+        self.outbound_queue_size = outbound_queue_size
+        self.outbound_audio_policy: AudioPolicy = outbound_audio_policy
+        self.ws: ClientConnection | None = None
         self.graph = self._build_graph()
         self.transcription = TranscriptionBuffer()
         self.session_start_time: datetime | None = None
         self.speech_end_ms: int | None = None
         self.ai_first_audio_ms: int | None = None
+        # Monotonic speech_stopped time, cleared once each turn latency is recorded
+        self._response_pending_since: float | None = None
+        self._audio_pending_since: float | None = None
         self.current_response_tools: list[str] = []
+        self._outbound: OutboundQueue | None = None
+        self.session_id = session_id or uuid.uuid4().hex
+        self.recorder = FlightRecorder(self.session_id, flight_recorder_size)
+        # First failure seen in this session (upstream, handler or OpenAI error)
+        self.error: str | None = None
+
+        # Upstream input audio batching (a 0 ms window disables it)
+        audio = user_settings.get("backend", {}).get("audio", {})
+        self.audio_batch_window_ms = int(extract_value(audio.get("batch_window_ms"), 0))
+        self.audio_batch_max_bytes = int(extract_value(audio.get("batch_max_bytes"), 0))
+        self._input_audio = bytearray()
+        self._input_flush_task: asyncio.Task | None = None
 
     @property
-    def websocket(self) -> websockets.WebSocketClientProtocol:
+    def websocket(self) -> ClientConnection:
         """Get the websocket connection"""
         if self.ws is None:
             raise RuntimeError("Not connected to OpenAI API")
         return self.ws
 
-    async def connect(self) -> None:
-        """Connect to OpenAI Realtime API via WebSocket"""
-        self.ws = await websockets.connect(
-            f"wss://api.openai.com/v1/realtime?model={self.model}",
-            additional_headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "OpenAI-Beta": "realtime=v1",
-            },
-        )
+    async def connect(self, pool: RealtimeConnectionPool | None = None) -> None:
+        """Connect to OpenAI Realtime API via WebSocket (pre-warmed from pool if available)"""
+        session_update = self.build_session_update()
+
+        if pool and (ws := await pool.acquire(session_update)):
+            self.ws = ws
+            # The buffered session.created is from when the connection was warmed
+            self.session_start_time = datetime.now()
+            logger.info(f"Using pre-warmed OpenAI Realtime connection (model: {self.model})")
+            return
+
+        self.ws = await open_realtime_connection(self.model, self.api_key, self.realtime_url)
         logger.info(f"Connected to OpenAI Realtime API (model: {self.model})")
-        await self._initialize_session()
+        await self._send_upstream("session.update", json.dumps(session_update))
 
     async def handle_browser_message(self, message: str) -> None:
         """Handle incoming audio from browser WebSocket"""
+        self.recorder.record_message(BROWSER_IN, message)
         try:
             data = json.loads(message)
             msg_type = data.get("type")
 
             if msg_type == "audio":
-                await self.websocket.send(
-                    json.dumps({"type": "input_audio_buffer.append", "audio": data.get("audio")})
-                )
+                if self.audio_batch_window_ms > 0:
+                    await self._append_input_audio(base64.b64decode(data.get("audio", "")))
+                else:
+                    await self._send_upstream(
+                        "input_audio_buffer.append",
+                        json.dumps(
+                            {"type": "input_audio_buffer.append", "audio": data.get("audio")}
+                        ),
+                    )
             elif msg_type in ("interrupt", "stop"):
-                await self.websocket.send(json.dumps({"type": "input_audio_buffer.clear"}))
+                # Pending audio would be cleared upstream anyway, so drop it here
+                self._discard_input_audio()
+                await self._send_upstream(
+                    "input_audio_buffer.clear", json.dumps({"type": "input_audio_buffer.clear"})
+                )
             elif msg_type == "commit_audio":
-                await self.websocket.send(json.dumps({"type": "input_audio_buffer.commit"}))
+                await self._flush_input_audio()
+                await self._send_upstream(
+                    "input_audio_buffer.commit", json.dumps({"type": "input_audio_buffer.commit"})
+                )
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON message: {e}")
         except Exception as e:
             logger.error(f"Error handling browser message: {e}")
 
-    async def process_openai_events(self, browser_send: Callable) -> None:
+    async def handle_browser_audio(self, pcm: bytes) -> None:
+        """Handle raw PCM16 audio frame from browser WebSocket (binary mode)"""
+        self.recorder.record(BROWSER_IN, "audio", len(pcm))
+        try:
+            if self.audio_batch_window_ms > 0:
+                await self._append_input_audio(pcm)
+            else:
+                await self._send_input_audio(pcm)
+        except Exception as e:
+            logger.error(f"Error handling browser audio: {e}")
+
+    @property
+    def outbound(self) -> OutboundQueue:
+        """Get the browser send queue"""
+        if self._outbound is None:
+            raise RuntimeError("Browser is not attached")
+        return self._outbound
+
+    async def process_openai_events(
+        self, browser_send: Callable[[str | bytes], Awaitable[None]]
+    ) -> None:
         """Process events from OpenAI and forward to browser"""
+
+        async def send(message: str | bytes) -> None:
+            self.recorder.record_message(BROWSER_OUT, message)
+            await browser_send(message)
+
+        # Browser writes go through a bounded queue so a slow browser never stalls upstream reads
+        self._outbound = OutboundQueue(
+            send,
+            max_size=self.outbound_queue_size,
+            audio_policy=self.outbound_audio_policy,
+        )
+        self._outbound.start()
+        try:
+            await self._receive_loop()
+        finally:
+            await self._outbound.close()
+
+    async def _receive_loop(self) -> None:
+        """Read upstream events and dispatch them to registered handlers"""
         while True:
             try:
                 raw_event = await self.websocket.recv()
-                event = json.loads(raw_event)
-                event_type = event.get("type")
-
+                event_type = _sniff_event_type(raw_event)
+                self.recorder.record(UPSTREAM_IN, event_type or "unknown", len(raw_event))
+                if event_type is not None:
+                    EVENTS.inc(type=event_type)
+
+                # Fast path: audio deltas are relayed without decoding the event
+                if (
+                    event_type == "response.audio.delta"
+                    and (audio_delta := _extract_audio_delta(raw_event)) is not None
+                ):
+                    event = {"type": event_type, "delta": audio_delta}
+
+                # Drop events nobody handles before parsing them
+                elif event_type is not None and event_type not in self.events:
+                    continue
+
+                else:
+                    event = json.loads(raw_event)
+                    if event_type is None:
+                        event_type = event.get("type")
+                        EVENTS.inc(type=str(event_type))
+
+            except websockets.ConnectionClosedOK as e:
+                # Normal close (e.g. the session length limit): not a failure
+                logger.info(f"OpenAI Realtime connection closed: {e}")
+                break
             except Exception as e:
                 logger.error(f"Error receiving/parsing OpenAI event: {e}")
+                ERRORS.inc(source="upstream")
+                self._fail(f"upstream: {type(e).__name__}: {e}")
                 break
 
             try:
-                # Session lifecycle: Connection established
-                if event_type == "session.created":
-                    self.session_start_time = datetime.now()
-                    await browser_send(
-                        json.dumps({"type": "session_created", "session": event.get("session")})
-                    )
+                await self.events.dispatch(self, event_type, event)
+            except ConnectionError as e:
+                logger.warning(f"Stopped relaying OpenAI events: {e}")
+                break
+            except Exception as e:
+                logger.error(f"Error processing OpenAI event {event_type}: {e}")
+                ERRORS.inc(source="event_handler")
+                self._fail(f"handler {event_type}: {type(e).__name__}: {e}")
+
+    # Session lifecycle: Connection established
+    @events.on("session.created")
+    async def _on_session_created(self, event: dict[str, Any]) -> None:
+        if self.session_start_time is None:
+            self.session_start_time = datetime.now()
+        await self.outbound.put(
+            json.dumps({"type": "session_created", "session": event.get("session")})
+        )
 
-                # Session lifecycle: Settings updated
-                elif event_type == "session.updated":
-                    await browser_send(
-                        json.dumps({"type": "session_updated", "session": event.get("session")})
-                    )
+    # Session lifecycle: Settings updated
+    @events.on("session.updated")
+    async def _on_session_updated(self, event: dict[str, Any]) -> None:
+        await self.outbound.put(
+            json.dumps({"type": "session_updated", "session": event.get("session")})
+        )
 
-                # Session lifecycle: Session error (auth, config issues)
-                elif event_type == "session.error":
-                    error_info = event.get("error", {})
-                    logger.error(f"Session error: {error_info}")
-                    await browser_send(json.dumps({"type": "session_error", "error": error_info}))
+    # Session lifecycle: Session error (auth, config issues)
+    @events.on("session.error")
+    async def _on_session_error(self, event: dict[str, Any]) -> None:
+        error_info = event.get("error", {})
+        logger.error(f"Session error: {error_info}")
+        await self.outbound.put(json.dumps({"type": "session_error", "error": error_info}))
+
+    # Session lifecycle: Session expired (token timeout)
+    @events.on("session.expired")
+    async def _on_session_expired(self, event: dict[str, Any]) -> None:
+        logger.warning("Session expired")
+        await self.outbound.put(
+            json.dumps(
+                {
+                    "type": "session_expired",
+                    "message": "Session expired, please reconnect",
+                }
+            )
+        )
 
-                # Session lifecycle: Session expired (token timeout)
-                elif event_type == "session.expired":
-                    logger.warning("Session expired")
-                    await browser_send(
-                        json.dumps(
-                            {
-                                "type": "session_expired",
-                                "message": "Session expired, please reconnect",
-                            }
-                        )
-                    )
+    # Session lifecycle: Session closed
+    @events.on("session.closed")
+    async def _on_session_closed(self, event: dict[str, Any]) -> None:
+        logger.info("Session closed by server")
+        await self.outbound.put(json.dumps({"type": "session_closed", "message": "Session closed"}))
+
+    # Response lifecycle: AI starts creating response
+    @events.on("response.created")
+    async def _on_response_created(self, event: dict[str, Any]) -> None:
+        if self._response_pending_since is not None:
+            SPEECH_TO_RESPONSE.observe(time.monotonic() - self._response_pending_since)
+            self._response_pending_since = None
+        await self.outbound.put(
+            json.dumps({"type": "response_created", "timestamp": datetime.now().isoformat()})
+        )
 
-                # Session lifecycle: Session closed
-                elif event_type == "session.closed":
-                    logger.info("Session closed by server")
-                    await browser_send(
-                        json.dumps({"type": "session_closed", "message": "Session closed"})
-                    )
+    # Response lifecycle: Response failed
+    @events.on("response.failed")
+    async def _on_response_failed(self, event: dict[str, Any]) -> None:
+        error_info = event.get("error", {})
+        logger.error(f"Response failed: {error_info}")
+        await self.outbound.put(
+            json.dumps(
+                {
+                    "type": "response_failed",
+                    "error": error_info,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+        )
 
-                # Response lifecycle: AI starts creating response
-                elif event_type == "response.created":
-                    await browser_send(
-                        json.dumps(
-                            {"type": "response_created", "timestamp": datetime.now().isoformat()}
-                        )
-                    )
+    # Response lifecycle: Response cancelled (user interrupt)
+    @events.on("response.cancelled")
+    async def _on_response_cancelled(self, event: dict[str, Any]) -> None:
+        logger.info("Response cancelled")
+        await self.outbound.put(
+            json.dumps({"type": "response_cancelled", "timestamp": datetime.now().isoformat()})
+        )
+        # Clear current response tools tracking
+        self.current_response_tools.clear()
+
+    # Audio output: AI starts generating audio (first audio event)
+    @events.on("response.audio.started")
+    async def _on_audio_started(self, event: dict[str, Any]) -> None:
+        # Mark exact moment AI starts audio generation for accurate latency
+        if self.speech_end_ms is not None and self.session_start_time is not None:
+            current_offset = datetime.now() - self.session_start_time
+            self.ai_first_audio_ms = int(current_offset.total_seconds() * 1000)
+
+    # Audio output: Streaming audio chunks from AI (fast path passes only "delta")
+    @events.on("response.audio.delta")
+    async def _on_audio_delta(self, event: dict[str, Any]) -> None:
+        if self._audio_pending_since is not None:
+            SPEECH_TO_AUDIO.observe(time.monotonic() - self._audio_pending_since)
+            self._audio_pending_since = None
+
+        # Fallback: If audio.started wasn't received, mark timing on first delta
+        if (
+            self.ai_first_audio_ms is None
+            and self.speech_end_ms is not None
+            and self.session_start_time is not None
+        ):
+            current_offset = datetime.now() - self.session_start_time
+            self.ai_first_audio_ms = int(current_offset.total_seconds() * 1000)
+
+        audio_data = event.get("delta", "")
+        # Binary mode: raw PCM16 bytes instead of base64 JSON
+        if self.binary_audio:
+            await self.outbound.put_audio(base64.b64decode(audio_data))
+        else:
+            # Base64 never needs JSON escaping, so splice it into the frame directly
+            await self.outbound.put_audio(f'{{"type":"audio_delta","audio":"{audio_data}"}}')
+
+    # Transcript: Interim text updates while AI is speaking
+    @events.on("response.audio_transcript.delta")
+    async def _on_transcript_delta(self, event: dict[str, Any]) -> None:
+        delta = event.get("delta", "")
+        await self.transcription.update_interim(delta)
+        await self.outbound.put_transcript_delta(delta)
+
+    # Transcript: Final AI response text completed
+    @events.on("response.audio_transcript.done")
+    async def _on_transcript_done(self, event: dict[str, Any]) -> None:
+        transcript = event.get("transcript", "")
+        await self.transcription.finalize_current()
+
+        # Calculate response time using relative offsets from session start
+        response_time_ms = None
+        if self.speech_end_ms is not None and self.ai_first_audio_ms is not None:
+            response_time_ms = self.ai_first_audio_ms - self.speech_end_ms
+
+        log_msg = f"Agent: {transcript}"
+        if response_time_ms is not None and response_time_ms > 0:
+            log_msg += f" (response time: {response_time_ms}ms)"
+        logger.info(log_msg)
+
+        await self.outbound.put(
+            json.dumps(
+                {
+                    "type": "transcript_done",
+                    "text": transcript,
+                    "timestamp": datetime.now().isoformat(),
+                    "response_time_ms": response_time_ms,
+                    "toolsUsed": self.current_response_tools.copy(),
+                }
+            )
+        )
 
-                # Response lifecycle: Response failed
-                elif event_type == "response.failed":
-                    error_info = event.get("error", {})
-                    logger.error(f"Response failed: {error_info}")
-                    await browser_send(
-                        json.dumps(
-                            {
-                                "type": "response_failed",
-                                "error": error_info,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+        self.current_response_tools.clear()
 
-                # Response lifecycle: Response cancelled (user interrupt)
-                elif event_type == "response.cancelled":
-                    logger.info("Response cancelled")
-                    await browser_send(
-                        json.dumps(
-                            {"type": "response_cancelled", "timestamp": datetime.now().isoformat()}
-                        )
-                    )
-                    # Clear current response tools tracking
-                    self.current_response_tools.clear()
-
-                # Audio output: AI starts generating audio (first audio event)
-                elif event_type == "response.audio.started":
-                    # Mark exact moment AI starts audio generation for accurate latency
-                    if self.speech_end_ms is not None and self.session_start_time is not None:
-                        current_offset = datetime.now() - self.session_start_time
-                        self.ai_first_audio_ms = int(current_offset.total_seconds() * 1000)
-
-                # Audio output: Streaming audio chunks from AI
-                elif event_type == "response.audio.delta":
-                    # Fallback: If audio.started wasn't received, mark timing on first delta
-                    if (
-                        self.ai_first_audio_ms is None
-                        and self.speech_end_ms is not None
-                        and self.session_start_time is not None
-                    ):
-                        current_offset = datetime.now() - self.session_start_time
-                        self.ai_first_audio_ms = int(current_offset.total_seconds() * 1000)
-
-                    audio_data = event.get("delta")
-                    await browser_send(json.dumps({"type": "audio_delta", "audio": audio_data}))
-
-                # Transcript: Interim text updates while AI is speaking
-                elif event_type == "response.audio_transcript.delta":
-                    delta = event.get("delta", "")
-                    await self.transcription.update_interim(delta)
-                    await browser_send(json.dumps({"type": "transcript_delta", "text": delta}))
-
-                # Transcript: Final AI response text completed
-                elif event_type == "response.audio_transcript.done":
-                    transcript = event.get("transcript", "")
-                    await self.transcription.finalize_current()
-
-                    # Calculate response time using relative offsets from session start
-                    response_time_ms = None
-                    if self.speech_end_ms is not None and self.ai_first_audio_ms is not None:
-                        response_time_ms = self.ai_first_audio_ms - self.speech_end_ms
-
-                    log_msg = f"Agent: {transcript}"
-                    if response_time_ms is not None and response_time_ms > 0:
-                        log_msg += f" (response time: {response_time_ms}ms)"
-                    logger.info(log_msg)
-
-                    await browser_send(
-                        json.dumps(
-                            {
-                                "type": "transcript_done",
-                                "text": transcript,
-                                "timestamp": datetime.now().isoformat(),
-                                "response_time_ms": response_time_ms,
-                                "toolsUsed": self.current_response_tools.copy(),
-                            }
-                        )
-                    )
+    # Tool calls: Process function calls from AI response
+    @events.on("response.done")
+    async def _on_response_done(self, event: dict[str, Any]) -> None:
+        try:
+            function_calls = [
+                output
+                for output in event.get("response", {}).get("output", [])
+                if output.get("type") == "function_call"
+            ]
+            if function_calls:
+                await self._handle_function_calls(function_calls)
+        except Exception as e:
+            logger.error(f"Error processing function calls: {e}")
+
+    # VAD: User started speaking (voice activity detected)
+    @events.on("input_audio_buffer.speech_started")
+    async def _on_speech_started(self, event: dict[str, Any]) -> None:
+        await self.outbound.put(json.dumps({"type": "speech_started"}))
+
+    # VAD: User stopped speaking (silence detected)
+    @events.on("input_audio_buffer.speech_stopped")
+    async def _on_speech_stopped(self, event: dict[str, Any]) -> None:
+        self._response_pending_since = self._audio_pending_since = time.monotonic()
+
+        # Store offset from session start for accurate response time calculation
+        audio_end_ms = event.get("audio_end_ms")
+        if audio_end_ms is not None:
+            self.speech_end_ms = audio_end_ms
+
+        self.ai_first_audio_ms = None
+        await self.outbound.put(
+            json.dumps({"type": "speech_stopped", "timestamp": datetime.now().isoformat()})
+        )
 
-                    self.current_response_tools.clear()
-
-                # Tool calls: Process function calls from AI response
-                elif event_type == "response.done":
-                    try:
-                        for output in event.get("response", {}).get("output", []):
-                            if output.get("type") == "function_call":
-                                await self._handle_function_call(output)
-                    except Exception as e:
-                        logger.error(f"Error processing function calls: {e}")
-
-                # VAD: User started speaking (voice activity detected)
-                elif event_type == "input_audio_buffer.speech_started":
-                    await browser_send(json.dumps({"type": "speech_started"}))
-
-                # VAD: User stopped speaking (silence detected)
-                elif event_type == "input_audio_buffer.speech_stopped":
-                    # Store offset from session start for accurate response time calculation
-                    audio_end_ms = event.get("audio_end_ms")
-                    if audio_end_ms is not None:
-                        self.speech_end_ms = audio_end_ms
-
-                    self.ai_first_audio_ms = None
-                    await browser_send(
-                        json.dumps(
-                            {"type": "speech_stopped", "timestamp": datetime.now().isoformat()}
-                        )
-                    )
+    # Transcript: User speech-to-text completed
+    @events.on("conversation.item.input_audio_transcription.completed")
+    async def _on_user_transcript(self, event: dict[str, Any]) -> None:
+        transcript = event.get("transcript", "")
+        logger.info(f"User: {transcript}")
+        await self.outbound.put(
+            json.dumps(
+                {
+                    "type": "user_transcript",
+                    "text": transcript,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+        )
 
-                # Transcript: User speech-to-text completed
-                elif event_type == "conversation.item.input_audio_transcription.completed":
-                    transcript = event.get("transcript", "")
-                    logger.info(f"User: {transcript}")
-                    await browser_send(
-                        json.dumps(
-                            {
-                                "type": "user_transcript",
-                                "text": transcript,
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-                    )
+    # Rate limits: Monitor API usage and warn if approaching limits
+    @events.on("rate_limits.updated")
+    async def _on_rate_limits_updated(self, event: dict[str, Any]) -> None:
+        rate_limits = event.get("rate_limits", [])
+        for limit_data in rate_limits:
+            if isinstance(limit_data, dict):
+                limit_type = limit_data.get("name", "unknown")
+                remaining = limit_data.get("remaining", 0)
+                limit = limit_data.get("limit", 0)
+                if limit > 0 and remaining / limit < 0.2:
+                    logger.warning(f"Rate limit warning: {limit_type} at {remaining}/{limit}")
+
+    # Error handling: Process and forward errors to browser
+    @events.on("error")
+    async def _on_error(self, event: dict[str, Any]) -> None:
+        error_code = event.get("error", {}).get("code", "")
+        if error_code != "response_cancel_not_active":
+            logger.error(f"OpenAI error: {event}")
+            ERRORS.inc(source="openai")
+            self._fail(f"openai: {error_code or 'error'}")
+            try:
+                await self.outbound.put(json.dumps({"type": "error", "error": event.get("error")}))
+            except Exception as e:
+                logger.warning(f"Failed to send error to browser: {e}")
 
-                # Rate limits: Monitor API usage and warn if approaching limits
-                elif event_type == "rate_limits.updated":
-                    rate_limits = event.get("rate_limits", [])
-                    for limit_data in rate_limits:
-                        if isinstance(limit_data, dict):
-                            limit_type = limit_data.get("name", "unknown")
-                            remaining = limit_data.get("remaining", 0)
-                            limit = limit_data.get("limit", 0)
-                            if limit > 0 and remaining / limit < 0.2:
-                                logger.warning(
-                                    f"Rate limit warning: {limit_type} at {remaining}/{limit}"
-                                )
-
-                # Error handling: Process and forward errors to browser
-                elif event_type == "error":
-                    error_code = event.get("error", {}).get("code", "")
-                    if error_code != "response_cancel_not_active":
-                        logger.error(f"OpenAI error: {event}")
-                        try:
-                            await browser_send(
-                                json.dumps({"type": "error", "error": event.get("error")})
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to send error to browser: {e}")
+    def _fail(self, reason: str) -> None:
+        """Remember the first session failure and mark it in the flight recorder"""
+        self.recorder.record(LOCAL, "error", 0)
+        if self.error is None:
+            self.error = reason
 
-            except Exception as e:
-                logger.error(f"Error processing OpenAI event {event_type}: {e}")
+    def stats(self) -> dict[str, Any]:
+        """Session counters (browser send queue depth, drops)"""
+        return {"outbound": self._outbound.stats() if self._outbound else {}}
 
     async def disconnect(self) -> None:
         """Disconnect from OpenAI Realtime API"""
+        self._discard_input_audio()
         if self.ws:
             await self.ws.close()
             self.ws = None
         await self.transcription.clear()
 
-    async def _initialize_session(self) -> None:
-        """Initialize session with backend settings"""
-        backend = self.user_settings.get("backend", {})
+    async def _append_input_audio(self, pcm: bytes) -> None:
+        """Buffer input audio, flushing on size limit or after the batch window"""
+        self._input_audio += pcm
+
+        if 0 < self.audio_batch_max_bytes <= len(self._input_audio):
+            await self._flush_input_audio()
+        elif self._input_flush_task is None:
+            self._input_flush_task = asyncio.create_task(self._flush_input_audio_later())
+
+    async def _flush_input_audio_later(self) -> None:
+        """Flush buffered input audio once the batch window elapses"""
+        await asyncio.sleep(self.audio_batch_window_ms / 1000)
+        self._input_flush_task = None
+        try:
+            await self._flush_input_audio()
+        except Exception as e:
+            logger.error(f"Error flushing input audio: {e}")
+
+    async def _flush_input_audio(self) -> None:
+        """Send buffered input audio as a single append message"""
+        if self._input_flush_task is not None:
+            self._input_flush_task.cancel()
+            self._input_flush_task = None
+
+        if not self._input_audio:
+            return
+
+        pcm = bytes(self._input_audio)
+        self._input_audio.clear()
+        await self._send_input_audio(pcm)
+
+    def _discard_input_audio(self) -> None:
+        """Drop buffered input audio without sending it"""
+        if self._input_flush_task is not None:
+            self._input_flush_task.cancel()
+            self._input_flush_task = None
+        self._input_audio.clear()
+
+    async def _send_input_audio(self, pcm: bytes) -> None:
+        """Send PCM16 audio upstream as input_audio_buffer.append"""
+        # Base64 output never needs JSON escaping, so build the frame directly
+        audio = base64.b64encode(pcm).decode("ascii")
+        await self._send_upstream(
+            "input_audio_buffer.append", f'{{"type":"input_audio_buffer.append","audio":"{audio}"}}'
+        )
 
-        # Helper to extract value from schema structure
-        def extract_value(setting, fallback):
-            if isinstance(setting, dict):
-                return setting.get("value", setting.get("default", fallback))
-            return setting if setting is not None else fallback
+    async def _send_upstream(self, event_type: str, message: str) -> None:
+        """Send serialized event to OpenAI"""
+        self.recorder.record(UPSTREAM_OUT, event_type, len(message))
+        await self.websocket.send(message)
+
+    def build_session_update(self) -> dict[str, Any]:
+        """Build session.update event from backend settings"""
+        backend = self.user_settings.get("backend", {})
 
         # Extract backend settings
         voice = extract_value(backend.get("voice"), "alloy")
@@ -369,30 +653,10 @@ class VoiceAgent:
 
         # Add tools if available
         if self.tools:
-            session_update["session"]["tools"] = [
-                {
-                    "type": "function",
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": self._get_tool_parameters(tool),
-                }
-                for tool in self.tools
-            ]
+            session_update["session"]["tools"] = self.tools.schemas
             session_update["session"]["tool_choice"] = "auto"
 
-        await self.websocket.send(json.dumps(session_update))
-
-    def _get_tool_parameters(self, tool: BaseTool) -> dict[str, Any]:
-        """Extract tool parameters for OpenAI format"""
-        if tool.args_schema is None:
-            return {"type": "object", "properties": {}, "required": []}
-
-        schema = tool.args_schema.model_json_schema()
-        return {
-            "type": "object",
-            "properties": schema.get("properties", {}),
-            "required": schema.get("required", []),
-        }
+        return session_update
 
     def _build_graph(self) -> CompiledStateGraph:
         """Build LangGraph StateGraph for managing agent workflow"""
@@ -408,48 +672,47 @@ class VoiceAgent:
         return graph.compile()
 
     async def _execute_tool_node(self, state: AgentState) -> AgentState:
-        """Node: Execute tools from state"""
+        """Node: Execute all tools from state concurrently"""
         tool_calls = state.get("tool_calls", [])
-        results = []
-
-        for tool_call in tool_calls:
-            tool_name = tool_call.get("name")
-            arguments = tool_call.get("arguments", {})
+        state["tool_results"] = list(
+            await asyncio.gather(*(self._run_tool(tool_call) for tool_call in tool_calls))
+        )
+        return state
 
-            tool = next((t for t in self.tools if t.name == tool_name), None)
-            if not tool:
-                results.append(
-                    {
-                        "call_id": tool_call.get("call_id"),
-                        "result": f"Error: Tool {tool_name} not found",
-                    }
-                )
-                continue
+    async def _run_tool(self, tool_call: dict[str, Any]) -> dict[str, Any]:
+        """Execute single tool call; errors become the call's result"""
+        tool_name = tool_call.get("name")
 
-            try:
-                result = await tool.ainvoke(arguments)
-                results.append(
-                    {
-                        "call_id": tool_call.get("call_id"),
-                        "result": str(result),
-                    }
-                )
-            except Exception as e:
-                logger.error(f"Tool execution error: {e}")
-                results.append(
-                    {
-                        "call_id": tool_call.get("call_id"),
-                        "result": f"Error: {str(e)}",
-                    }
-                )
+        tool = self.tools.get(tool_name)
+        if not tool:
+            return {
+                "call_id": tool_call.get("call_id"),
+                "result": f"Error: Tool {tool_name} not found",
+            }
 
-        state["tool_results"] = results
-        return state
+        start = time.perf_counter()
+        try:
+            arguments = json.loads(tool_call.get("arguments") or "{}")
+            result = await tool.ainvoke(arguments)
+            return {
+                "call_id": tool_call.get("call_id"),
+                "result": str(result),
+            }
+        except Exception as e:
+            logger.error(f"Tool execution error ({tool_name}): {e}")
+            ERRORS.inc(source="tool")
+            return {
+                "call_id": tool_call.get("call_id"),
+                "result": f"Error: {str(e)}",
+            }
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - start, tool=tool.name)
 
     async def _send_result_node(self, state: AgentState) -> AgentState:
-        """Node: Send tool results back to OpenAI"""
+        """Node: Send all tool results back to OpenAI, then request one response"""
         for result in state.get("tool_results", []):
-            await self.websocket.send(
+            await self._send_upstream(
+                "conversation.item.create",
                 json.dumps(
                     {
                         "type": "conversation.item.create",
@@ -459,27 +722,68 @@ class VoiceAgent:
                             "output": json.dumps({"result": result["result"]}),
                         },
                     }
-                )
+                ),
             )
 
         # Trigger new response generation
-        await self.websocket.send(json.dumps({"type": "response.create"}))
+        await self._send_upstream("response.create", json.dumps({"type": "response.create"}))
         return state
 
-    async def _handle_function_call(self, function_call: dict[str, Any]) -> None:
-        """Handle function call from OpenAI using LangGraph"""
-        call_id = function_call.get("call_id")
-        function_name = function_call.get("name")
-        arguments = json.loads(function_call.get("arguments", "{}"))
-        logger.info(f"Tool: {function_name}")
+    async def _handle_function_calls(self, function_calls: list[dict[str, Any]]) -> None:
+        """Handle all function calls of one response from OpenAI using LangGraph"""
+        tool_calls = []
+        for function_call in function_calls:
+            function_name = function_call.get("name")
+            logger.info(f"Tool: {function_name}")
 
-        # Track tool usage for current response
-        if function_name and function_name not in self.current_response_tools:
-            self.current_response_tools.append(function_name)
+            # Track tool usage for current response
+            if function_name and function_name not in self.current_response_tools:
+                self.current_response_tools.append(function_name)
 
-        initial_state: AgentState = {
-            "tool_calls": [{"call_id": call_id, "name": function_name, "arguments": arguments}],
-            "tool_results": [],
-        }
+            # Arguments stay raw so a malformed call only fails itself
+            tool_calls.append(
+                {
+                    "call_id": function_call.get("call_id"),
+                    "name": function_name,
+                    "arguments": function_call.get("arguments", "{}"),
+                }
+            )
+
+        initial_state: AgentState = {"tool_calls": tool_calls, "tool_results": []}
 
         await self.graph.ainvoke(initial_state)
+
+
+# Per-handler stats of the upstream event registry, read at scrape time
+REGISTRY.register(
+    Counter(
+        "voice_event_handler_calls_total",
+        "Upstream event handler calls",
+        ("type",),
+        collect=partial(VoiceAgent.events.collect, "calls"),
+    )
+)
+REGISTRY.register(
+    Counter(
+        "voice_event_handler_errors_total",
+        "Upstream event handler failures",
+        ("type",),
+        collect=partial(VoiceAgent.events.collect, "errors"),
+    )
+)
+REGISTRY.register(
+    Counter(
+        "voice_event_handler_seconds_total",
+        "Time spent in upstream event handlers",
+        ("type",),
+        collect=partial(VoiceAgent.events.collect, "total_s"),
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "voice_event_handler_max_seconds",
+        "Slowest upstream event handler call",
+        ("type",),
+        collect=partial(VoiceAgent.events.collect, "max_s"),
+    )
+)
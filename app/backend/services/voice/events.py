@@ -0,0 +1,74 @@
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Handlers receive the owning agent and the decoded upstream event
+EventHandler = Callable[[Any, dict[str, Any]], Awaitable[None]]
+
+
+class HandlerStats:
+    __slots__ = ("calls", "errors", "total_s", "max_s")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+
+class EventRegistry:
+    def __init__(self):
+        self.handlers: dict[str, EventHandler] = {}
+        self.stats: dict[str, HandlerStats] = {}
+
+    def __contains__(self, event_type: str) -> bool:
+        """Check whether any handler is registered for event type"""
+        return event_type in self.handlers
+
+    def register(self, event_type: str, handler: EventHandler) -> None:
+        """Register handler for event type, replacing any existing one"""
+        if event_type in self.handlers:
+            logger.info(f"Replacing handler for '{event_type}'")
+        self.handlers[event_type] = handler
+        self.stats.setdefault(event_type, HandlerStats())
+
+    def unregister(self, event_type: str) -> None:
+        """Remove handler for event type (its events are dropped afterwards)"""
+        self.handlers.pop(event_type, None)
+
+    def on(self, event_type: str) -> Callable[[EventHandler], EventHandler]:
+        """Decorator form of register()"""
+
+        def decorator(handler: EventHandler) -> EventHandler:
+            self.register(event_type, handler)
+            return handler
+
+        return decorator
+
+    async def dispatch(self, agent: Any, event_type: str, event: dict[str, Any]) -> None:
+        """Run handler for event; events without a handler are ignored"""
+        handler = self.handlers.get(event_type)
+        if handler is None:
+            return
+
+        stats = self.stats[event_type]
+        start = time.perf_counter()
+        try:
+            await handler(agent, event)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.calls += 1
+            stats.total_s += elapsed
+            if elapsed > stats.max_s:
+                stats.max_s = elapsed
+
+    def collect(self, field: str) -> dict[tuple[str, ...], float]:
+        """One HandlerStats field per event type, as metric samples"""
+        return {(event_type,): getattr(stats, field) for event_type, stats in self.stats.items()}
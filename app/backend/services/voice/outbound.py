@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import json
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
+
+from app.backend.logger import get_logger
+from app.backend.metrics import OUTBOUND_COALESCED, OUTBOUND_DROPPED, REGISTRY, Gauge
+
+logger = get_logger(__name__)
+
+AudioPolicy = Literal["block", "drop_oldest"]
+
+# Queue item kinds
+CONTROL = 0
+AUDIO = 1
+TRANSCRIPT_DELTA = 2
+
+# Queues of this worker's live sessions, for the depth gauges
+_live: set["OutboundQueue"] = set()
+
+
+class OutboundQueue:
+    def __init__(
+        self,
+        send: Callable[[str | bytes], Awaitable[None]],
+        max_size: int = 256,
+        audio_policy: AudioPolicy = "block",
+    ):
+        self._send = send
+        self.max_size = max(1, max_size)
+        self.audio_policy = audio_policy
+        # Items are [kind, payload]; transcript deltas keep raw text until sent
+        self._items: deque[list[Any]] = deque()
+        self._has_items = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._writer: asyncio.Task | None = None
+        self._error: BaseException | None = None
+        self.sent = 0
+        self.max_depth = 0
+        self.dropped_audio = 0
+        self.coalesced_transcripts = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent"""
+        return len(self._items)
+
+    def start(self) -> None:
+        """Start the writer task"""
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._run())
+            _live.add(self)
+
+    async def close(self, drain_timeout: float = 1.0) -> None:
+        """Stop the writer task after flushing what it can within drain_timeout"""
+        _live.discard(self)
+        if self._writer:
+            if self._error is None:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._drained.wait(), drain_timeout)
+            self._writer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._writer
+            self._writer = None
+        self._items.clear()
+
+    async def put(self, message: str | bytes) -> None:
+        """Queue control message, waiting for space if the queue is full"""
+        await self._wait_for_space()
+        self._append(CONTROL, message)
+
+    async def put_audio(self, message: str | bytes) -> None:
+        """Queue audio message according to the audio policy"""
+        if len(self._items) >= self.max_size and self.audio_policy == "drop_oldest":
+            self._drop_oldest_audio()
+        await self._wait_for_space()
+        self._append(AUDIO, message)
+
+    async def put_transcript_delta(self, text: str) -> None:
+        """Queue transcript delta, merging into the previous one if it is still waiting"""
+        self._check_writer()
+        if self._items and self._items[-1][0] == TRANSCRIPT_DELTA:
+            self._items[-1][1] += text
+            self.coalesced_transcripts += 1
+            OUTBOUND_COALESCED.inc()
+            return
+        await self._wait_for_space()
+        self._append(TRANSCRIPT_DELTA, text)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and drop counters"""
+        return {
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped_audio": self.dropped_audio,
+            "coalesced_transcripts": self.coalesced_transcripts,
+        }
+
+    def _append(self, kind: int, payload: Any) -> None:
+        """Append item and wake the writer"""
+        self._items.append([kind, payload])
+        self._drained.clear()
+        if len(self._items) > self.max_depth:
+            self.max_depth = len(self._items)
+        self._has_items.set()
+
+    def _drop_oldest_audio(self) -> None:
+        """Make room by discarding the oldest queued audio chunk"""
+        for i, (kind, _) in enumerate(self._items):
+            if kind == AUDIO:
+                del self._items[i]
+                self.dropped_audio += 1
+                OUTBOUND_DROPPED.inc()
+                return
+
+    def _check_writer(self) -> None:
+        """Raise if the writer task has failed"""
+        if self._error is not None:
+            raise ConnectionError(f"Browser writer stopped: {self._error}")
+
+    async def _wait_for_space(self) -> None:
+        """Block until the queue has room (backpressure to the caller)"""
+        while True:
+            self._check_writer()
+            if len(self._items) < self.max_size:
+                return
+            self._has_space.clear()
+            await self._has_space.wait()
+
+    async def _run(self) -> None:
+        """Writer: send queued messages to the browser in order"""
+        try:
+            while True:
+                if not self._items:
+                    self._drained.set()
+                    self._has_items.clear()
+                    await self._has_items.wait()
+                    continue
+
+                kind, payload = self._items.popleft()
+                self._has_space.set()
+
+                if kind == TRANSCRIPT_DELTA:
+                    payload = json.dumps({"type": "transcript_delta", "text": payload})
+
+                await self._send(payload)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Browser writer stopped: {type(e).__name__}: {e}")
+            self._error = e
+            self._has_space.set()
+
+
+def _collect_depth() -> dict[tuple[str, ...], float]:
+    """Messages waiting in all live browser queues"""
+    return {(): sum(queue.depth for queue in _live)}
+
+
+def _collect_max_depth() -> dict[tuple[str, ...], float]:
+    """Depth of the most backed-up live browser queue"""
+    return {(): max((queue.depth for queue in _live), default=0)}
+
+
+REGISTRY.register(
+    Gauge(
+        "voice_outbound_queue_depth",
+        "Messages waiting in live browser queues",
+        collect=_collect_depth,
+    )
+)
+REGISTRY.register(
+    Gauge(
+        "voice_outbound_queue_max_depth",
+        "Depth of the most backed-up live browser queue",
+        collect=_collect_max_depth,
+    )
+)
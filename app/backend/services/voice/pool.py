@@ -0,0 +1,226 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from websockets.asyncio.client import ClientConnection
+from websockets.protocol import State
+
+from app.backend.logger import get_logger
+from app.backend.metrics import POOL_ACQUIRES, REGISTRY, Gauge
+
+logger = get_logger(__name__)
+
+# Number of distinct session configs kept warm; older configs stop being refilled
+MAX_WARM_CONFIGS = 2
+MAINTENANCE_INTERVAL_S = 30
+
+
+class PooledConnection:
+    __slots__ = ("ws", "created_at")
+
+    def __init__(self, ws: ClientConnection):
+        self.ws = ws
+        self.created_at = time.monotonic()
+
+
+class RealtimeConnectionPool:
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[ClientConnection]],
+        size: int,
+        max_age_s: float,
+    ):
+        self._connect = connect
+        self.size = size
+        self.max_age_s = max_age_s
+        # Config key -> serialized session.update, most recently used last
+        self._configs: OrderedDict[str, str] = OrderedDict()
+        self._idle: dict[str, deque[PooledConnection]] = {}
+        self._refills: dict[str, asyncio.Task] = {}
+        self._drains: set[asyncio.Task] = set()
+        self._maintenance: asyncio.Task | None = None
+        # Bumped when the session config changes; part of every key
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def config_key(self, session_update: dict[str, Any]) -> str:
+        """Config version and hash of the effective session config (instructions, voice,
+        tools, VAD...)"""
+        payload = json.dumps(session_update, sort_keys=True, separators=(",", ":"))
+        return f"{self.version}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+    def start(self) -> None:
+        """Start background refresh of idle connections"""
+        if self._maintenance is None:
+            self._maintenance = asyncio.create_task(self._maintain())
+
+    async def close(self) -> None:
+        """Stop background tasks and close idle connections"""
+        tasks = [t for t in (self._maintenance, *self._refills.values(), *self._drains) if t]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._maintenance = None
+        self._refills.clear()
+        self._drains.clear()
+
+        for key in list(self._idle):
+            await self._close_idle(key)
+
+    def invalidate(self) -> None:
+        """Move to a new config version: stop refilling and close all idle connections"""
+        self.version += 1
+        self._configs.clear()
+        for task in self._refills.values():
+            task.cancel()
+        self._refills.clear()
+
+        idle = [conn for conn_idle in self._idle.values() for conn in conn_idle]
+        self._idle.clear()
+        if idle:
+            task = asyncio.create_task(self._drain(idle))
+            self._drains.add(task)
+            task.add_done_callback(self._drains.discard)
+
+    def warm(self, session_update: dict[str, Any]) -> None:
+        """Start keeping connections configured with session_update ready"""
+        self._schedule_refill(self._track(session_update))
+
+    async def acquire(self, session_update: dict[str, Any]) -> ClientConnection | None:
+        """Check out a pre-configured connection, or None on a miss"""
+        key = self._track(session_update)
+        idle = self._idle.get(key)
+
+        while idle:
+            conn = idle.popleft()
+            if self._is_usable(conn):
+                self.hits += 1
+                POOL_ACQUIRES.inc(result="hit")
+                self._schedule_refill(key)
+                return conn.ws
+            await self._close(conn)
+
+        self.misses += 1
+        POOL_ACQUIRES.inc(result="miss")
+        self._schedule_refill(key)
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        """Pool size and hit rate"""
+        requests = self.hits + self.misses
+        return {
+            "target_size": self.size,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "configs": len(self._configs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 3) if requests else None,
+        }
+
+    def _track(self, session_update: dict[str, Any]) -> str:
+        """Register config as wanted, evicting the least recently used one"""
+        key = self.config_key(session_update)
+        if key in self._configs:
+            self._configs.move_to_end(key)
+        else:
+            self._configs[key] = json.dumps(session_update)
+            while len(self._configs) > MAX_WARM_CONFIGS:
+                stale_key, _ = self._configs.popitem(last=False)
+                if task := self._refills.pop(stale_key, None):
+                    task.cancel()
+        return key
+
+    def _is_usable(self, conn: PooledConnection) -> bool:
+        """Check connection is open and not about to expire"""
+        return conn.ws.state is State.OPEN and time.monotonic() - conn.created_at < self.max_age_s
+
+    def _schedule_refill(self, key: str) -> None:
+        """Top up idle connections for key in the background"""
+        task = self._refills.get(key)
+        if task is None or task.done():
+            self._refills[key] = asyncio.create_task(self._refill(key))
+
+    async def _refill(self, key: str) -> None:
+        """Open and configure connections until the key has `size` idle ones"""
+        idle = self._idle.setdefault(key, deque())
+        while key in self._configs and len(idle) < self.size:
+            try:
+                ws = await self._connect()
+                await ws.send(self._configs[key])
+            except Exception as e:
+                logger.warning(f"Failed to pre-warm Realtime connection: {e}")
+                return
+
+            # Config may have been evicted while connecting
+            if key not in self._configs:
+                await self._close(PooledConnection(ws))
+                return
+            idle.append(PooledConnection(ws))
+
+    async def _drain(self, idle: list[PooledConnection]) -> None:
+        """Close connections of an old config version"""
+        for conn in idle:
+            await self._close(conn)
+        logger.info(f"Closed {len(idle)} pre-warmed Realtime connections after config change")
+
+    async def _close_idle(self, key: str) -> None:
+        """Close all idle connections for key"""
+        idle = self._idle.pop(key, deque())
+        while idle:
+            await self._close(idle.popleft())
+
+    async def _close(self, conn: PooledConnection) -> None:
+        """Close connection, ignoring errors"""
+        with contextlib.suppress(Exception):
+            await conn.ws.close()
+
+    async def _maintain(self) -> None:
+        """Replace idle connections before they expire or after they drop"""
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL_S)
+            for key, idle in list(self._idle.items()):
+                # Configs evicted from the pool are closed here
+                if key not in self._configs:
+                    await self._close_idle(key)
+                    continue
+
+                stale = [conn for conn in idle if not self._is_usable(conn)]
+                for conn in stale:
+                    idle.remove(conn)
+                    await self._close(conn)
+
+                if len(idle) < self.size:
+                    self._schedule_refill(key)
+
+
+# Worker-wide pool, created at startup when REALTIME_POOL_SIZE > 0
+_pool: RealtimeConnectionPool | None = None
+
+
+def get_realtime_pool() -> RealtimeConnectionPool | None:
+    """Get the worker's Realtime connection pool (None if disabled)"""
+    return _pool
+
+
+def set_realtime_pool(pool: RealtimeConnectionPool | None) -> None:
+    """Install the worker's Realtime connection pool"""
+    global _pool
+    _pool = pool
+
+
+def _collect_idle() -> dict[tuple[str, ...], float]:
+    """Idle connection count of the worker's pool"""
+    return {(): _pool.stats()["idle"]} if _pool else {}
+
+
+REGISTRY.register(
+    Gauge("voice_realtime_pool_idle", "Idle pre-warmed Realtime connections", collect=_collect_idle)
+)
@@ -0,0 +1,129 @@
+import json
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Message directions, relative to this server
+UPSTREAM_IN = 0
+UPSTREAM_OUT = 1
+BROWSER_IN = 2
+BROWSER_OUT = 3
+LOCAL = 4
+DIRECTIONS = ("upstream_in", "upstream_out", "browser_in", "browser_out", "local")
+
+_TYPE_PREFIXES = ('{"type":"', '{"type": "')
+# Distinct event types tracked per session; further ones are recorded as "other"
+MAX_EVENT_TYPES = 512
+
+
+def message_type(message: str | bytes) -> str:
+    """Return type of a serialized message from its prefix ("binary" for bytes frames)"""
+    if isinstance(message, bytes):
+        return "binary"
+    for prefix in _TYPE_PREFIXES:
+        if message.startswith(prefix):
+            end = message.find('"', len(prefix))
+            if end != -1:
+                return message[len(prefix) : end]
+    return "unknown"
+
+
+class FlightRecorder:
+    def __init__(self, session_id: str, capacity: int = 2048):
+        self.session_id = session_id
+        self.capacity = max(1, capacity)
+        self.started_at = datetime.now()
+        self._t0 = time.monotonic()
+        # Preallocated columns; event types are stored as codes into _types
+        self._times = array("d", bytes(8 * self.capacity))
+        self._sizes = array("I", bytes(4 * self.capacity))
+        self._directions = array("B", bytes(self.capacity))
+        self._codes = array("H", bytes(2 * self.capacity))
+        self._types: list[str] = ["other"]
+        self._type_codes: dict[str, int] = {"other": 0}
+        self.count = 0
+
+    def record(self, direction: int, event_type: str, size: int) -> None:
+        """Record one message (metadata only, never payloads)"""
+        code = self._type_codes.get(event_type)
+        if code is None:
+            if len(self._types) < MAX_EVENT_TYPES:
+                code = self._type_codes[event_type] = len(self._types)
+                self._types.append(event_type)
+            else:
+                code = 0
+
+        i = self.count % self.capacity
+        self._times[i] = time.monotonic()
+        self._sizes[i] = min(size, 0xFFFFFFFF)
+        self._directions[i] = direction
+        self._codes[i] = code
+        self.count += 1
+
+    def record_message(self, direction: int, message: str | bytes) -> None:
+        """Record serialized message, taking its type from the prefix"""
+        self.record(direction, message_type(message), len(message))
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Recorded messages, oldest first"""
+        start = max(0, self.count - self.capacity)
+        entries = []
+        for n in range(start, self.count):
+            i = n % self.capacity
+            entries.append(
+                {
+                    "t_ms": round((self._times[i] - self._t0) * 1000, 3),
+                    "direction": DIRECTIONS[self._directions[i]],
+                    "type": self._types[self._codes[i]],
+                    "bytes": self._sizes[i],
+                }
+            )
+        return entries
+
+    def snapshot(self) -> dict[str, Any]:
+        """Session summary with the buffered messages"""
+        return {**self.summary(), "entries": self.entries()}
+
+    def summary(self) -> dict[str, Any]:
+        """Session id, start time and message counts"""
+        return {
+            "session_id": self.session_id,
+            "started_at": self.started_at.isoformat(),
+            "recorded": self.count,
+            "dropped": max(0, self.count - self.capacity),
+        }
+
+    def dump(self, directory: str | Path, reason: str = "") -> Path:
+        """Write snapshot as JSON into directory and return the file path"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = directory / f"{stamp}-{self.session_id}.json"
+        path.write_text(json.dumps({"reason": reason, **self.snapshot()}, indent=2))
+        return path
+
+
+# Recorders of sessions in progress in this worker, by session id
+_live: dict[str, FlightRecorder] = {}
+
+
+def register_recorder(recorder: FlightRecorder) -> None:
+    """Make a live session's recorder visible to the admin API"""
+    _live[recorder.session_id] = recorder
+
+
+def unregister_recorder(session_id: str) -> None:
+    """Remove recorder of a finished session"""
+    _live.pop(session_id, None)
+
+
+def get_recorder(session_id: str) -> FlightRecorder | None:
+    """Get recorder of a live session"""
+    return _live.get(session_id)
+
+
+def live_recorders() -> list[FlightRecorder]:
+    """Recorders of all live sessions"""
+    return list(_live.values())
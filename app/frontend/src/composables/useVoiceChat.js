@@ -2,6 +2,8 @@ import { onUnmounted, ref } from 'vue'
 
 const WS_URL = `${location.protocol === 'https:' ? 'wss:' : 'ws:'}//${location.host}/ws`
 const SAMPLE_RATE = 24000
+// Subprotocol for raw PCM16 binary audio frames (falls back to base64 JSON if not accepted)
+const BINARY_AUDIO_SUBPROTOCOL = 'pcm16'
 
 export function useVoiceChat(settings) {
   const isConnected = ref(false)
@@ -36,7 +38,8 @@ export function useVoiceChat(settings) {
       connectionError.value = null
       transcripts.value = []
 
-      ws = new WebSocket(WS_URL)
+      ws = new WebSocket(WS_URL, [BINARY_AUDIO_SUBPROTOCOL])
+      ws.binaryType = 'arraybuffer'
 
       ws.onopen = async () => {
         connectionState.value = 'connected'
@@ -45,6 +48,10 @@ export function useVoiceChat(settings) {
       }
 
       ws.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          handleAudioDelta(event.data)
+          return
+        }
         const data = JSON.parse(event.data)
         handleMessage(data)
       }
@@ -87,10 +94,7 @@ export function useVoiceChat(settings) {
         speakNotification(data.message)
         break
       case 'audio_delta':
-        if (!isAiThinking.value) {
-          isAiThinking.value = true
-        }
-        playAudio(data.audio)
+        handleAudioDelta(base64ToArrayBuffer(data.audio))
         break
       case 'user_transcript':
         if (pendingTranscript) {
@@ -147,6 +151,13 @@ export function useVoiceChat(settings) {
     }
   }
 
+  function handleAudioDelta(pcm16Buffer) {
+    if (!isAiThinking.value) {
+      isAiThinking.value = true
+    }
+    playAudio(pcm16Buffer)
+  }
+
   function speakNotification(text) {
     if ('speechSynthesis' in window) {
       const utterance = new SpeechSynthesisUtterance(text)
@@ -215,10 +226,13 @@ export function useVoiceChat(settings) {
       workletNode.port.onmessage = (event) => {
         if (event.data.type === 'audiodata') {
           const pcm16 = convertToPCM16(event.data.data)
-          const base64 = arrayBufferToBase64(pcm16)
 
           if (ws && ws.readyState === WebSocket.OPEN) {
-            ws.send(JSON.stringify({ type: 'audio', audio: base64 }))
+            if (ws.protocol === BINARY_AUDIO_SUBPROTOCOL) {
+              ws.send(pcm16)
+            } else {
+              ws.send(JSON.stringify({ type: 'audio', audio: arrayBufferToBase64(pcm16) }))
+            }
           }
         }
       }
@@ -249,8 +263,8 @@ export function useVoiceChat(settings) {
     }
   }
 
-  function playAudio(base64Audio) {
-    audioQueue.push(base64Audio)
+  function playAudio(pcm16Buffer) {
+    audioQueue.push(pcm16Buffer)
     if (!isPlaying) processAudioQueue()
   }
 
@@ -261,7 +275,7 @@ export function useVoiceChat(settings) {
     }
 
     isPlaying = true
-    const base64Audio = audioQueue.shift()
+    const pcm16Buffer = audioQueue.shift()
 
     const responseDelayMs = settings?.value?.client?.interaction?.response_delay_ms
     const responseDelay = typeof responseDelayMs === 'object'
@@ -273,7 +287,7 @@ export function useVoiceChat(settings) {
     }
 
     try {
-      await playChunk(base64Audio)
+      await playChunk(pcm16Buffer)
     } catch (error) {
       console.error('Playback error:', error)
     }
@@ -281,16 +295,11 @@ export function useVoiceChat(settings) {
     processAudioQueue()
   }
 
-  function playChunk(base64Audio) {
+  function playChunk(pcm16Buffer) {
     return new Promise((resolve) => {
       try {
-        const audioData = atob(base64Audio)
-        const pcm16Data = new Int16Array(audioData.length / 2)
-        const dataView = new DataView(new ArrayBuffer(audioData.length))
-
-        for (let i = 0; i < audioData.length; i++) {
-          dataView.setUint8(i, audioData.charCodeAt(i))
-        }
+        const pcm16Data = new Int16Array(Math.floor(pcm16Buffer.byteLength / 2))
+        const dataView = new DataView(pcm16Buffer)
 
         for (let i = 0; i < pcm16Data.length; i++) {
           pcm16Data[i] = dataView.getInt16(i * 2, true)
@@ -358,6 +367,15 @@ export function useVoiceChat(settings) {
     return buffer
   }
 
+  function base64ToArrayBuffer(base64) {
+    const binary = atob(base64)
+    const bytes = new Uint8Array(binary.length)
+    for (let i = 0; i < binary.length; i++) {
+      bytes[i] = binary.charCodeAt(i)
+    }
+    return bytes.buffer
+  }
+
   function arrayBufferToBase64(buffer) {
     const bytes = new Uint8Array(buffer)
     let binary = ''
@@ -0,0 +1,96 @@
+"""Microbenchmark: per-event CPU cost of relaying response.audio.delta to the browser.
+
+Compares the original parse/re-serialize path against the prefix-sniffing fast path
+(JSON splice and binary PCM16 modes).
+
+Usage:
+    python benchmarks/bench_audio_relay.py [--events 20000] [--chunk-ms 50 100 200]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from app.backend.services.voice.agent import _extract_audio_delta  # noqa: E402
+
+SAMPLE_RATE = 24000
+BYTES_PER_SAMPLE = 2
+
+
+def make_event(chunk_ms: int) -> str:
+    """Build a realistic upstream audio delta event"""
+    pcm = os.urandom(SAMPLE_RATE * BYTES_PER_SAMPLE * chunk_ms // 1000)
+    return json.dumps(
+        {
+            "type": "response.audio.delta",
+            "event_id": "event_BenchmarkEvent0001",
+            "response_id": "resp_BenchmarkResponse01",
+            "item_id": "item_BenchmarkItem000001",
+            "output_index": 0,
+            "content_index": 0,
+            "delta": base64.b64encode(pcm).decode("ascii"),
+        },
+        separators=(",", ":"),
+    )
+
+
+def baseline_path(raw_event: str) -> str:
+    """Original path: full parse, dispatch on type, re-serialize"""
+    event = json.loads(raw_event)
+    if event.get("type") == "response.audio.delta":
+        return json.dumps({"type": "audio_delta", "audio": event.get("delta")})
+    return ""
+
+
+def fast_json_path(raw_event: str) -> str:
+    """Fast path, JSON mode: sniff prefix and splice the payload"""
+    audio = _extract_audio_delta(raw_event)
+    return f'{{"type":"audio_delta","audio":"{audio}"}}'
+
+
+def fast_binary_path(raw_event: str) -> bytes:
+    """Fast path, binary mode: sniff prefix and decode to raw PCM16"""
+    return base64.b64decode(_extract_audio_delta(raw_event))  # type: ignore[arg-type]
+
+
+def measure(func, raw_event: str, events: int) -> float:
+    """Return CPU nanoseconds per event"""
+    func(raw_event)
+    start = time.process_time_ns()
+    for _ in range(events):
+        func(raw_event)
+    return (time.process_time_ns() - start) / events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--chunk-ms", type=int, nargs="+", default=[50, 100, 200])
+    args = parser.parse_args()
+
+    paths = [
+        ("baseline (loads+dumps)", baseline_path),
+        ("fast path (json splice)", fast_json_path),
+        ("fast path (binary)", fast_binary_path),
+    ]
+
+    for chunk_ms in args.chunk_ms:
+        raw_event = make_event(chunk_ms)
+        assert json.loads(fast_json_path(raw_event)) == json.loads(baseline_path(raw_event))
+
+        print(f"\n{chunk_ms} ms chunk ({len(raw_event)} bytes/event, {args.events} events)")
+        baseline_ns = None
+        for name, func in paths:
+            ns = measure(func, raw_event, args.events)
+            baseline_ns = baseline_ns or ns
+            print(f"  {name:<26} {ns / 1000:8.2f} us/event  {baseline_ns / ns:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
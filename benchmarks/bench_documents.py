@@ -0,0 +1,330 @@
+"""Benchmark: document hashing, loading and chunking throughput of the indexer.
+
+Generates synthetic docx/pdf/xlsx/pptx/txt corpora of several sizes and measures each
+stage (hash, load, split, stream = load and split as indexing runs them, and pool =
+stream in a child process of the parsing pool) for throughput and peak Python heap
+(tracemalloc; for pool, the heap of this process only; as in the app, the parser
+process is started once, by the warm-up run, and reused). Results can be compared
+against stored baselines; a stage slower (or hungrier) than its baseline by more than
+--tolerance fails the run.
+
+Runs offline: the service gets an in-memory Qdrant store and fake embeddings, and
+placeholder settings are used when no .env is present.
+
+Usage:
+    python benchmarks/bench_documents.py [--sizes small medium] [--formats pdf docx]
+    python benchmarks/bench_documents.py --check            # compare with baselines
+    python benchmarks/bench_documents.py --update-baseline  # record new baselines
+
+Baselines are machine dependent; refresh them on the machine that runs --check.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+# Settings required by the service; nothing is contacted
+for _name, _value in {
+    "OPENAI_API_KEY": "offline",
+    "OPENAI_MODEL_NAME": "offline",
+    "TAVILY_API_KEY": "",
+    "QDRANT_URL": "http://localhost:6333",
+    "COLLECTION_NAME": "bench",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from docx import Document as DocxDocument  # noqa: E402
+from langchain_core.embeddings import DeterministicFakeEmbedding  # noqa: E402
+from openpyxl import Workbook  # noqa: E402
+from pptx import Presentation  # noqa: E402
+from pptx.util import Inches  # noqa: E402
+from qdrant_client import AsyncQdrantClient  # noqa: E402
+
+from app.backend.services import document_parser  # noqa: E402
+from app.backend.services.parsing_pool import ParsingPool  # noqa: E402
+from app.backend.services.rag_service import RAGService  # noqa: E402
+from app.backend.services.vector_store import QdrantVectorStore  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "baselines" / "documents.json"
+# Approximate amount of text per generated document
+SIZES = {"small": 50_000, "medium": 500_000, "large": 2_000_000}
+FORMATS = ("txt", "docx", "pdf", "xlsx", "pptx")
+STAGES = ("hash", "load", "split", "stream", "pool")
+
+VOCABULARY = (
+    "voice agent realtime session audio transcript latency buffer search file index "
+    "vector chunk embedding query response tool result document page sheet slide "
+    "quarterly revenue forecast meeting notes project status summary customer report"
+)
+WORDS = VOCABULARY.split()
+
+
+def make_paragraphs(target_chars: int, seed: int = 7) -> list[str]:
+    """Deterministic pseudo-prose, split into paragraphs"""
+    rng = random.Random(seed)
+    paragraphs = []
+    total = 0
+    while total < target_chars:
+        sentences = []
+        for _ in range(rng.randint(3, 8)):
+            words = rng.choices(WORDS, k=rng.randint(8, 20))
+            sentences.append(" ".join(words).capitalize() + ".")
+        paragraph = " ".join(sentences)
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    return paragraphs
+
+
+def write_txt(path: Path, paragraphs: list[str]) -> None:
+    path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+
+def write_docx(path: Path, paragraphs: list[str]) -> None:
+    doc = DocxDocument()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    doc.save(str(path))
+
+
+def write_xlsx(path: Path, paragraphs: list[str]) -> None:
+    workbook = Workbook()
+    sheet = workbook.active
+    for i, paragraph in enumerate(paragraphs):
+        words = paragraph.split()
+        # Mixed cell types as in real spreadsheets
+        sheet.append([i, " ".join(words[:6]), len(words), " ".join(words[6:]), i * 1.5])
+    workbook.save(str(path))
+
+
+def write_pptx(path: Path, paragraphs: list[str], per_slide: int = 4) -> None:
+    prs = Presentation()
+    layout = prs.slide_layouts[6]
+    for start in range(0, len(paragraphs), per_slide):
+        slide = prs.slides.add_slide(layout)
+        box = slide.shapes.add_textbox(Inches(0.5), Inches(0.5), Inches(9), Inches(6))
+        box.text_frame.text = "\n".join(paragraphs[start : start + per_slide])
+    prs.save(str(path))
+
+
+def write_pdf(path: Path, paragraphs: list[str], lines_per_page: int = 60) -> None:
+    """Minimal text PDF (Helvetica, one text object per page)"""
+    lines = []
+    for paragraph in paragraphs:
+        words = paragraph.split()
+        for start in range(0, len(words), 14):
+            lines.append(" ".join(words[start : start + 14]))
+        lines.append("")
+
+    pages = [lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    objects = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        text = "".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") Tj T* "
+            for line in page_lines
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+
+
+WRITERS: dict[str, Callable[[Path, list[str]], None]] = {
+    "txt": write_txt,
+    "docx": write_docx,
+    "pdf": write_pdf,
+    "xlsx": write_xlsx,
+    "pptx": write_pptx,
+}
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple[float, float, object]:
+    """Best wall time over repeat runs, peak traced heap (MiB) of one run, and the result"""
+    # Traced run first; it also warms caches before timing
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, peak / 2**20, result
+
+
+def run(
+    service: RAGService, pool: ParsingPool, path: Path, repeat: int
+) -> dict[str, dict[str, float]]:
+    """Measure all stages for one document"""
+    file_mb = path.stat().st_size / 2**20
+    results = {}
+
+    seconds, peak_mib, _ = measure(lambda: service._calculate_hash(str(path)), repeat)
+    results["hash"] = {"mb_s": file_mb / seconds, "peak_mib": peak_mib}
+
+    seconds, peak_mib, text = measure(lambda: document_parser.load_text(str(path)), repeat)
+    results["load"] = {"mb_s": file_mb / seconds, "peak_mib": peak_mib}
+
+    text_mb = len(text.encode("utf-8")) / 2**20
+    seconds, peak_mib, chunks = measure(lambda: list(document_parser.split_stream([text])), repeat)
+    results["split"] = {
+        "mb_s": text_mb / seconds,
+        "chunks_s": len(chunks) / seconds,
+        "peak_mib": peak_mib,
+    }
+
+    seconds, peak_mib, count = measure(
+        lambda: sum(1 for _ in document_parser.iter_chunks(str(path))), repeat
+    )
+    results["stream"] = {
+        "mb_s": file_mb / seconds,
+        "chunks_s": count / seconds,
+        "peak_mib": peak_mib,
+    }
+
+    async def parse_in_pool() -> int:
+        async with pool.parse(str(path)) as pooled:
+            return sum(1 for _ in pooled)
+
+    seconds, peak_mib, count = measure(lambda: asyncio.run(parse_in_pool()), repeat)
+    results["pool"] = {
+        "mb_s": file_mb / seconds,
+        "chunks_s": count / seconds,
+        "peak_mib": peak_mib,
+    }
+    return results
+
+
+def check(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """Stages slower or using more memory than baseline beyond tolerance"""
+    failures = []
+    for key, stages in results.items():
+        for stage, metrics in stages.items():
+            baseline = baselines.get(key, {}).get(stage)
+            if not baseline:
+                continue
+            for metric, value in metrics.items():
+                expected = baseline.get(metric)
+                if expected is None:
+                    continue
+                if metric == "peak_mib":
+                    # Small heaps are noisy; allow at least 1 MiB of slack
+                    regressed = value > max(expected * (1 + tolerance), expected + 1)
+                else:
+                    regressed = value < expected * (1 - tolerance)
+                if regressed:
+                    failures.append(
+                        f"{key} {stage} {metric}: {value:.2f} (baseline {expected:.2f})"
+                    )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["small", "medium"])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="fail on regressions")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    args = parser.parse_args()
+
+    service = RAGService(
+        store=QdrantVectorStore(AsyncQdrantClient(location=":memory:"), "bench"),
+        embeddings=DeterministicFakeEmbedding(size=1536),
+    )
+    pool = ParsingPool(workers=1, timeout_s=600)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as corpus:
+        for size in args.sizes:
+            paragraphs = make_paragraphs(SIZES[size])
+            for fmt in args.formats:
+                path = Path(corpus) / f"{size}.{fmt}"
+                WRITERS[fmt](path, paragraphs)
+                key = f"{fmt}/{size}"
+                results[key] = run(service, pool, path, args.repeat)
+
+                print(f"\n{key} ({path.stat().st_size / 2**20:.2f} MiB)")
+                for stage in STAGES:
+                    metrics = results[key][stage]
+                    chunks = (
+                        f"{metrics['chunks_s']:10.0f} chunks/s" if "chunks_s" in metrics else ""
+                    )
+                    print(
+                        f"  {stage:<6} {metrics['mb_s']:9.2f} MB/s  "
+                        f"peak {metrics['peak_mib']:7.2f} MiB {chunks}"
+                    )
+    asyncio.run(pool.close())
+
+    if args.update_baseline:
+        baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        baselines.update(
+            {
+                key: {
+                    stage: {metric: round(value, 3) for metric, value in metrics.items()}
+                    for stage, metrics in stages.items()
+                }
+                for key, stages in results.items()
+            }
+        )
+        BASELINE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaselines written to {BASELINE_FILE}")
+
+    if args.check:
+        if not BASELINE_FILE.exists():
+            sys.exit(f"No baselines at {BASELINE_FILE}; run with --update-baseline first")
+        failures = check(results, json.loads(BASELINE_FILE.read_text()), args.tolerance)
+        if failures:
+            print(f"\n{len(failures)} regression(s) beyond {args.tolerance:.0%}:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: upsert throughput and per-file search latency of the local vector index.
+
+Fills a LocalVectorStore in a temporary directory with random unit vectors spread over
+--files source files, then times filtered top-k searches with exact scoring and, when
+hnswlib is installed, through the HNSW graph.
+
+Usage:
+    python benchmarks/bench_vector_store.py [--points 5000 50000] [--files 10] [--queries 500]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+# Settings required by the app modules; nothing is contacted
+for _name, _value in {
+    "OPENAI_API_KEY": "offline",
+    "OPENAI_MODEL_NAME": "offline",
+    "TAVILY_API_KEY": "",
+    "COLLECTION_NAME": "bench",
+    "POSTGRES_USER": "bench",
+    "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from app.backend.services import vector_store  # noqa: E402
+from app.backend.services.vector_store import EMBEDDING_SIZE, LocalVectorStore  # noqa: E402
+
+BATCH_SIZE = 256
+
+
+async def run(points: int, files: int, queries: int, hnsw: bool, k: int) -> dict[str, float]:
+    """Fill a fresh index and time searches"""
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as data_dir:
+        store = LocalVectorStore(data_dir, "bench", hnsw_min_points=1 if hnsw else points + 1)
+        start = time.perf_counter()
+        for i in range(0, points, BATCH_SIZE):
+            count = min(BATCH_SIZE, points - i)
+            await store.upsert(
+                [f"point-{i + j}" for j in range(count)],
+                rng.standard_normal((count, EMBEDDING_SIZE), dtype=np.float32).tolist(),
+                [
+                    {"page_content": "", "metadata": {"source": f"file-{(i + j) % files}"}}
+                    for j in range(count)
+                ],
+            )
+        upsert_s = time.perf_counter() - start
+
+        latencies = []
+        for i in range(queries):
+            query = rng.standard_normal(EMBEDDING_SIZE, dtype=np.float32).tolist()
+            start = time.perf_counter()
+            await store.search(query, f"file-{i % files}", k)
+            latencies.append(time.perf_counter() - start)
+        await store.close()
+
+    latencies.sort()
+    return {
+        "upsert_points_s": points / upsert_s,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", nargs="+", type=int, default=[5000, 50000])
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    modes = ["exact", "hnsw"] if vector_store.hnswlib else ["exact"]
+    if not vector_store.hnswlib:
+        print("hnswlib not installed; measuring exact search only")
+    for points in args.points:
+        for mode in modes:
+            result = asyncio.run(run(points, args.files, args.queries, mode == "hnsw", args.k))
+            print(
+                f"{points:>8} points {mode:<5}  upsert {result['upsert_points_s']:8.0f} points/s  "
+                f"search p50 {result['p50_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
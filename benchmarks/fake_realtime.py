@@ -0,0 +1,223 @@
+"""Offline stand-in for the OpenAI Realtime WebSocket API, for load tests.
+
+Speaks the event types VoiceAgent handles. A turn starts once the client has sent
+--turn-audio-ms of input audio (or commits the buffer): speech started/stopped, the
+user transcript, then a response streaming audio deltas at real-time pace together
+with transcript deltas, followed by rate_limits.updated. Every --tool-every'th turn
+the first response is a function call instead, answered after the tool output.
+
+The first 8 bytes of every audio chunk carry the send time (time.time_ns(), big
+endian), so clients on the same host can measure relay latency.
+
+Usage:
+    python benchmarks/fake_realtime.py [--port 9100] [--response-audio-ms 2000]
+    OPENAI_REALTIME_URL=ws://127.0.0.1:9100/v1/realtime make run-be
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import os
+import struct
+import time
+import uuid
+from dataclasses import dataclass
+
+from websockets.asyncio.server import ServerConnection, serve
+
+SAMPLE_RATE = 24000
+BYTES_PER_SAMPLE = 2
+BYTES_PER_MS = SAMPLE_RATE * BYTES_PER_SAMPLE // 1000
+# Timestamp prefix padded to 9 bytes so its base64 can be spliced before the body
+STAMP_BYTES = 9
+
+
+@dataclass
+class FakeConfig:
+    chunk_ms: int = 100
+    turn_audio_ms: int = 1000
+    response_audio_ms: int = 2000
+    tool_every: int = 3
+    tool_name: str = "list_directory"
+    tool_arguments: str = '{"directory_path": "."}'
+
+
+def _serialize(event_type: str, **fields) -> str:
+    """Serialize event compactly with "type" first, as the Realtime API does"""
+    return json.dumps({"type": event_type, **fields}, separators=(",", ":"))
+
+
+def _stamp() -> str:
+    """Base64 of the current time prefix for an audio chunk"""
+    return base64.b64encode(struct.pack(">Qx", time.time_ns())).decode("ascii")
+
+
+class FakeSession:
+    def __init__(self, ws: ServerConnection, config: FakeConfig):
+        self.ws = ws
+        self.config = config
+        self.input_bytes = 0
+        self.turns = 0
+        self.response: asyncio.Task | None = None
+        chunk_bytes = config.chunk_ms * BYTES_PER_MS
+        # Audio body is constant; only the timestamp prefix changes per chunk
+        self.audio_body = base64.b64encode(os.urandom(chunk_bytes - STAMP_BYTES)).decode("ascii")
+
+    async def run(self) -> None:
+        """Serve one client connection until it closes"""
+        await self.send("session.created", session={"id": f"sess_{uuid.uuid4().hex[:16]}"})
+        try:
+            async for raw in self.ws:
+                await self.handle(json.loads(raw))
+        finally:
+            if self.response:
+                self.response.cancel()
+
+    async def handle(self, event: dict) -> None:
+        """React to a client event"""
+        event_type = event.get("type")
+
+        if event_type == "session.update":
+            await self.send("session.updated", session=event.get("session", {}))
+        elif event_type == "input_audio_buffer.append":
+            # Decoded size without decoding
+            self.input_bytes += len(event.get("audio", "")) * 3 // 4
+            if self.input_bytes >= self.config.turn_audio_ms * BYTES_PER_MS:
+                self.start_turn()
+        elif event_type == "input_audio_buffer.commit":
+            self.start_turn()
+        elif event_type == "input_audio_buffer.clear":
+            self.input_bytes = 0
+        elif event_type == "response.create":
+            self.start_response(self.spoken_response())
+
+    def start_turn(self) -> None:
+        """Finish user speech and answer it"""
+        self.input_bytes = 0
+        self.turns += 1
+        use_tool = self.config.tool_every > 0 and self.turns % self.config.tool_every == 0
+        self.start_response(self.user_turn(use_tool))
+
+    def start_response(self, coro) -> None:
+        """Run response in the background; a running one is left to finish"""
+        if self.response and not self.response.done():
+            coro.close()
+            return
+        self.response = asyncio.create_task(coro)
+
+    async def user_turn(self, use_tool: bool) -> None:
+        """Speech events and transcript, then a response"""
+        item_id = f"item_{uuid.uuid4().hex[:16]}"
+        audio_end_ms = self.turns * self.config.turn_audio_ms
+        await self.send("input_audio_buffer.speech_started", item_id=item_id)
+        await self.send(
+            "input_audio_buffer.speech_stopped", item_id=item_id, audio_end_ms=audio_end_ms
+        )
+        await self.send(
+            "conversation.item.input_audio_transcription.completed",
+            item_id=item_id,
+            transcript=f"Fake user utterance {self.turns}",
+        )
+        if use_tool:
+            await self.function_call_response()
+        else:
+            await self.spoken_response()
+
+    async def function_call_response(self) -> None:
+        """Response that only asks for a tool call"""
+        response_id = f"resp_{uuid.uuid4().hex[:16]}"
+        await self.send("response.created", response={"id": response_id, "status": "in_progress"})
+        output = {
+            "type": "function_call",
+            "name": self.config.tool_name,
+            "call_id": f"call_{uuid.uuid4().hex[:16]}",
+            "arguments": self.config.tool_arguments,
+        }
+        await self.send(
+            "response.done",
+            response={"id": response_id, "status": "completed", "output": [output]},
+        )
+
+    async def spoken_response(self) -> None:
+        """Response streaming audio and transcript deltas at real-time pace"""
+        response_id = f"resp_{uuid.uuid4().hex[:16]}"
+        item_id = f"item_{uuid.uuid4().hex[:16]}"
+        await self.send("response.created", response={"id": response_id, "status": "in_progress"})
+
+        chunks = max(1, self.config.response_audio_ms // self.config.chunk_ms)
+        words = []
+        start = time.monotonic()
+        for i in range(chunks):
+            delay = start + i * self.config.chunk_ms / 1000 - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.ws.send(
+                '{"type":"response.audio.delta","response_id":"'
+                f'{response_id}","item_id":"{item_id}","output_index":0,"content_index":0,'
+                f'"delta":"{_stamp()}{self.audio_body}"}}'
+            )
+            word = f"word{i}"
+            words.append(word)
+            await self.send(
+                "response.audio_transcript.delta",
+                response_id=response_id,
+                item_id=item_id,
+                delta=f"{word} ",
+            )
+
+        await self.send(
+            "response.audio_transcript.done",
+            response_id=response_id,
+            item_id=item_id,
+            transcript=" ".join(words),
+        )
+        await self.send(
+            "response.done",
+            response={"id": response_id, "status": "completed", "output": [{"type": "message"}]},
+        )
+        await self.send(
+            "rate_limits.updated",
+            rate_limits=[{"name": "tokens", "limit": 1_000_000, "remaining": 999_000}],
+        )
+
+    async def send(self, event_type: str, **fields) -> None:
+        """Send event to the client"""
+        await self.ws.send(_serialize(event_type, **fields))
+
+
+async def serve_fake_realtime(config: FakeConfig, host: str = "127.0.0.1", port: int = 9100):
+    """Start the fake server and return the websockets Server"""
+
+    async def handler(ws: ServerConnection) -> None:
+        with contextlib.suppress(Exception):
+            await FakeSession(ws, config).run()
+
+    return await serve(handler, host, port, max_size=None)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--turn-audio-ms", type=int, default=1000)
+    parser.add_argument("--response-audio-ms", type=int, default=2000)
+    parser.add_argument("--tool-every", type=int, default=3, help="0 disables function calls")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        chunk_ms=args.chunk_ms,
+        turn_audio_ms=args.turn_audio_ms,
+        response_audio_ms=args.response_audio_ms,
+        tool_every=args.tool_every,
+    )
+    server = await serve_fake_realtime(config, args.host, args.port)
+    print(f"Fake Realtime API on ws://{args.host}:{args.port}/v1/realtime")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -0,0 +1,286 @@
+"""Load test: N simulated browser clients against the voice WebSocket endpoint.
+
+Each client streams --turn-audio-ms of microphone audio per turn at real-time pace and
+waits for the agent's answer. Upstream is benchmarks/fake_realtime.py, so nothing
+leaves the machine (the backend still needs its local Postgres).
+
+Reports:
+    relay latency   fake upstream send -> browser receive, per audio chunk
+    turn latency    last microphone chunk sent -> first answer audio received
+    CPU / memory    of the backend worker process, per session (Linux /proc)
+
+Usage:
+    # Start the fake upstream and a backend worker pointing at it, then load it
+    python benchmarks/load_test.py --spawn --sessions 50 --turns 3
+
+    # Or load an already running backend (started with OPENAI_REALTIME_URL set)
+    python benchmarks/load_test.py --url ws://127.0.0.1:8000/ws --pid <worker pid>
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import websockets
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from benchmarks.fake_realtime import (  # noqa: E402
+    BYTES_PER_MS,
+    FakeConfig,
+    serve_fake_realtime,
+)
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class Results:
+    def __init__(self):
+        self.relay_ms: list[float] = []
+        self.turn_ms: list[float] = []
+        self.sessions_ok = 0
+        self.sessions_failed = 0
+        self.turns = 0
+        self.errors: list[str] = []
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def chunk_sent_ns(pcm_prefix: bytes) -> int:
+    """Send time stamped into an audio chunk by the fake upstream"""
+    return struct.unpack(">Q", pcm_prefix[:8])[0]
+
+
+def read_process(pid: int) -> tuple[float, int] | None:
+    """CPU seconds and RSS bytes of a process (Linux only)"""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        fields = stat[stat.rindex(")") + 2 :].split()
+        cpu_s = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return cpu_s, int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+async def run_client(args: argparse.Namespace, results: Results) -> None:
+    """One simulated browser: stream microphone audio and wait for each answer"""
+    subprotocols = ["pcm16"] if args.binary else None
+    chunk = bytes(args.chunk_ms * BYTES_PER_MS)
+    chunk_b64 = base64.b64encode(chunk).decode("ascii")
+    chunks_per_turn = max(1, args.turn_audio_ms // args.chunk_ms)
+    answered = asyncio.Event()
+    state = {"speech_end": None}
+
+    async def receive(ws) -> None:
+        async for message in ws:
+            if isinstance(message, bytes):
+                sent_ns = chunk_sent_ns(message)
+            elif message.startswith('{"type":"audio_delta"'):
+                # Only the timestamp prefix needs decoding
+                start = message.index('"audio":"') + 9
+                sent_ns = chunk_sent_ns(base64.b64decode(message[start : start + 12]))
+            else:
+                if json.loads(message).get("type") == "transcript_done":
+                    answered.set()
+                continue
+
+            now_ns = time.time_ns()
+            results.relay_ms.append((now_ns - sent_ns) / 1e6)
+            if state["speech_end"] is not None:
+                results.turn_ms.append((time.monotonic() - state["speech_end"]) * 1000)
+                state["speech_end"] = None
+
+    try:
+        async with websockets.connect(args.url, subprotocols=subprotocols, max_size=None) as ws:
+            receiver = asyncio.create_task(receive(ws))
+            try:
+                for _ in range(args.turns):
+                    answered.clear()
+                    start = time.monotonic()
+                    for i in range(chunks_per_turn):
+                        delay = start + i * args.chunk_ms / 1000 - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        if args.binary:
+                            await ws.send(chunk)
+                        else:
+                            await ws.send(f'{{"type":"audio","audio":"{chunk_b64}"}}')
+                    state["speech_end"] = time.monotonic()
+
+                    await asyncio.wait_for(answered.wait(), args.turn_timeout_s)
+                    results.turns += 1
+            finally:
+                receiver.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await receiver
+        results.sessions_ok += 1
+    except Exception as e:
+        results.sessions_failed += 1
+        results.errors.append(f"{type(e).__name__}: {e}")
+
+
+async def sample_process(pid: int, peak: dict[str, int], stop: asyncio.Event) -> None:
+    """Track peak RSS of the backend worker"""
+    while not stop.is_set():
+        if sample := read_process(pid):
+            peak["rss"] = max(peak["rss"], sample[1])
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(stop.wait(), 0.25)
+
+
+async def wait_for_backend(url: str, timeout_s: float) -> None:
+    """Wait until the backend answers its health check"""
+    health_url = url.replace("ws", "http", 1).rsplit("/", 1)[0] + "/health"
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            await asyncio.to_thread(urllib.request.urlopen, health_url, timeout=2)
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.5)
+
+
+def spawn_backend(port: int, realtime_url: str) -> subprocess.Popen:
+    """Start a single backend worker pointing at the fake upstream"""
+    env = {**os.environ, "OPENAI_REALTIME_URL": realtime_url}
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.backend.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=Path(__file__).parents[1],
+        env=env,
+    )
+
+
+def report(args: argparse.Namespace, results: Results, elapsed_s: float, process: dict) -> None:
+    """Print summary"""
+    print(f"\nSessions: {results.sessions_ok} ok, {results.sessions_failed} failed")
+    print(f"Turns completed: {results.turns} in {elapsed_s:.1f}s")
+    for name, values in (("Relay latency", results.relay_ms), ("Turn latency", results.turn_ms)):
+        worst = max(values, default=float("nan"))
+        print(
+            f"{name:<14} p50 {percentile(values, 50):8.2f} ms  p95 {percentile(values, 95):8.2f} ms"
+            f"  p99 {percentile(values, 99):8.2f} ms  max {worst:8.2f} ms  (n={len(values)})"
+        )
+
+    if process:
+        sessions = max(1, args.sessions)
+        cores = process["cpu_s"] / elapsed_s
+        rss_delta = max(0, process["peak_rss"] - process["base_rss"])
+        print(f"Backend CPU:   {cores * 100:.1f}% total, {cores * 100 / sessions:.2f}% per session")
+        print(
+            f"Backend RSS:   {process['base_rss'] / 2**20:.1f} MiB idle, "
+            f"{process['peak_rss'] / 2**20:.1f} MiB peak, "
+            f"{rss_delta / sessions / 2**10:.0f} KiB per session"
+        )
+    else:
+        print("Backend CPU/memory: not measured (pass --pid or --spawn, Linux only)")
+
+    for error in sorted(set(results.errors))[:5]:
+        print(f"  error: {error}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--ramp-s", type=float, default=2.0, help="spread session starts")
+    parser.add_argument("--binary", action="store_true", help="use the pcm16 subprotocol")
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    parser.add_argument("--turn-audio-ms", type=int, default=1000)
+    parser.add_argument("--response-audio-ms", type=int, default=2000)
+    parser.add_argument("--tool-every", type=int, default=3)
+    parser.add_argument("--turn-timeout-s", type=float, default=30.0)
+    parser.add_argument("--pid", type=int, help="backend worker pid for CPU/memory")
+    parser.add_argument("--spawn", action="store_true", help="start fake upstream and backend")
+    parser.add_argument("--fake-port", type=int, default=9100)
+    parser.add_argument("--backend-port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake_server = None
+    backend = None
+    pid = args.pid
+    if args.spawn:
+        config = FakeConfig(
+            chunk_ms=args.chunk_ms,
+            turn_audio_ms=args.turn_audio_ms,
+            response_audio_ms=args.response_audio_ms,
+            tool_every=args.tool_every,
+        )
+        fake_server = await serve_fake_realtime(config, port=args.fake_port)
+        backend = spawn_backend(args.backend_port, f"ws://127.0.0.1:{args.fake_port}/v1/realtime")
+        args.url = f"ws://127.0.0.1:{args.backend_port}/ws"
+        pid = backend.pid
+
+    try:
+        await wait_for_backend(args.url, timeout_s=30)
+
+        results = Results()
+        baseline = read_process(pid) if pid else None
+        peak = {"rss": baseline[1] if baseline else 0}
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_process(pid, peak, stop)) if baseline else None
+
+        started = time.monotonic()
+        clients = []
+        for _ in range(args.sessions):
+            clients.append(asyncio.create_task(run_client(args, results)))
+            if args.sessions > 1:
+                await asyncio.sleep(args.ramp_s / (args.sessions - 1))
+        await asyncio.gather(*clients)
+        elapsed_s = time.monotonic() - started
+
+        stop.set()
+        if sampler:
+            await sampler
+
+        process = {}
+        if baseline and (final := read_process(pid)):
+            process = {
+                "cpu_s": final[0] - baseline[0],
+                "base_rss": baseline[1],
+                "peak_rss": peak["rss"],
+            }
+        report(args, results, elapsed_s, process)
+    finally:
+        if backend:
+            backend.terminate()
+            backend.wait(timeout=10)
+        if fake_server:
+            fake_server.close()
+            await fake_server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())